@@ -9,57 +9,93 @@ from __future__ import annotations
 import argparse
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional, TextIO
 
 from .core import build_report, cluster, format_alert_message
-from .notify.dispatch import dispatch_notifications
 from .paths import default_state_dir
-from .report import print_text_report, report_to_json
-from .sources import read_lines
-from .state import BaselineState, PatternDB, fmt_local_ts, parse_duration
+from .report import print_text_report, write_report_json
+from .sources import describe_source, read_lines
+from .state import BaselineState, PatternDB, fmt_local_ts, now_epoch, parse_duration
 
 
-def parse_args(argv=None) -> argparse.Namespace:
-    """Build the argument parser and return parsed arguments."""
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once per process.
+
+    Defaults that depend on the environment (state paths, notifier
+    settings) are left unset here and applied by :func:`parse_args` on
+    every call, so caching the parser never freezes them.
+    """
     parser = argparse.ArgumentParser(
         prog="log-whisperer",
         description="Cluster logs into patterns, detect new patterns, and optionally notify.",
     )
 
     src = parser.add_argument_group("Sources (choose one)")
-    src.add_argument("--docker", help="docker logs --since <since> <container>")
-    src.add_argument("--compose", help="docker compose logs --since <since> <service>")
-    src.add_argument("--compose-all", action="store_true", help="docker compose logs --since <since> (all services)")
-    src.add_argument("--service", help="journalctl -u <service> --since <since>")
+    src.add_argument("--docker", help="docker logs --since <since> --tail <lines> <container>")
+    src.add_argument("--compose", help="docker compose logs --since <since> --tail <lines> <service>")
+    src.add_argument("--compose-all", action="store_true", help="docker compose logs --since <since> --tail <lines> (all services)")
+    src.add_argument("--service", help="journalctl -u <service> --since <since> -n <lines>")
     src.add_argument("--file", help="Read last N lines from a file")
 
     parser.add_argument("--since", default="1h", help='Time window: e.g. "10m", "1h", "today"')
     parser.add_argument("--lines", type=int, default=5000, help="Max lines to process")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch logs newer than the previous --incremental run (capped by --since)",
+    )
     parser.add_argument("--show-new", action="store_true", help="Only show never-seen patterns")
     parser.add_argument("--min-severity", choices=["INFO", "WARN", "ERROR"], default="INFO", help="Filter by severity")
     parser.add_argument("--show-samples", action="store_true", help="Print one raw sample line per pattern")
     parser.add_argument("--json", action="store_true", help="Output report as JSON (still updates DB)")
 
-    state_dir = default_state_dir()
-    parser.add_argument("--state-db", default=str(state_dir / "patterns.db"), help="Pattern DB path")
-    parser.add_argument("--baseline-state", default=str(state_dir / "baseline.json"), help="Baseline state path")
+    parser.add_argument("--state-db", help="Pattern DB path")
+    parser.add_argument("--baseline-state", help="Baseline state path")
     parser.add_argument("--reset", action="store_true", help="Reset pattern DB and baseline state")
 
     parser.add_argument("--baseline-learn", type=str, default="", help='Start baseline learning like "24h", "30m"')
 
     notify = parser.add_argument_group("Notifications")
-    notify.add_argument("--notify-ntfy-topic", default=os.getenv("LOGWHISPERER_NTFY_TOPIC", ""), help="ntfy topic")
-    notify.add_argument("--notify-ntfy-server", default=os.getenv("LOGWHISPERER_NTFY_SERVER", "https://ntfy.sh"), help="ntfy server")
-    notify.add_argument("--notify-telegram-token", default=os.getenv("LOGWHISPERER_TELEGRAM_TOKEN", ""), help="Telegram bot token")
-    notify.add_argument("--notify-telegram-chat-id", default=os.getenv("LOGWHISPERER_TELEGRAM_CHAT_ID", ""), help="Telegram chat id")
-    notify.add_argument("--notify-email-host", default=os.getenv("LOGWHISPERER_SMTP_HOST", ""), help="SMTP host")
-    notify.add_argument("--notify-email-port", type=int, default=int(os.getenv("LOGWHISPERER_SMTP_PORT", "587")), help="SMTP port")
-    notify.add_argument("--notify-email-user", default=os.getenv("LOGWHISPERER_SMTP_USER", ""), help="SMTP username")
-    notify.add_argument("--notify-email-pass", default=os.getenv("LOGWHISPERER_SMTP_PASS", ""), help="SMTP password")
-    notify.add_argument("--notify-email-from", default=os.getenv("LOGWHISPERER_EMAIL_FROM", ""), help="Email From")
-    notify.add_argument("--notify-email-to", default=os.getenv("LOGWHISPERER_EMAIL_TO", ""), help="Email To")
+    notify.add_argument("--notify-ntfy-topic", help="ntfy topic")
+    notify.add_argument("--notify-ntfy-server", help="ntfy server")
+    notify.add_argument("--notify-telegram-token", help="Telegram bot token")
+    notify.add_argument("--notify-telegram-chat-id", help="Telegram chat id")
+    notify.add_argument("--notify-email-host", help="SMTP host")
+    notify.add_argument("--notify-email-port", type=int, help="SMTP port")
+    notify.add_argument("--notify-email-user", help="SMTP username")
+    notify.add_argument("--notify-email-pass", help="SMTP password")
+    notify.add_argument("--notify-email-from", help="Email From")
+    notify.add_argument("--notify-email-to", help="Email To")
     notify.add_argument("--notify-email-no-tls", action="store_true", help="Disable STARTTLS for SMTP")
+    return parser
+
+
+def _env_defaults() -> dict:
+    """Return the defaults read from the environment at parse time."""
+    state_dir = default_state_dir()
+    return dict(
+        state_db=str(state_dir / "patterns.db"),
+        baseline_state=str(state_dir / "baseline.json"),
+        notify_ntfy_topic=os.getenv("LOGWHISPERER_NTFY_TOPIC", ""),
+        notify_ntfy_server=os.getenv("LOGWHISPERER_NTFY_SERVER", "https://ntfy.sh"),
+        notify_telegram_token=os.getenv("LOGWHISPERER_TELEGRAM_TOKEN", ""),
+        notify_telegram_chat_id=os.getenv("LOGWHISPERER_TELEGRAM_CHAT_ID", ""),
+        notify_email_host=os.getenv("LOGWHISPERER_SMTP_HOST", ""),
+        notify_email_port=int(os.getenv("LOGWHISPERER_SMTP_PORT", "587")),
+        notify_email_user=os.getenv("LOGWHISPERER_SMTP_USER", ""),
+        notify_email_pass=os.getenv("LOGWHISPERER_SMTP_PASS", ""),
+        notify_email_from=os.getenv("LOGWHISPERER_EMAIL_FROM", ""),
+        notify_email_to=os.getenv("LOGWHISPERER_EMAIL_TO", ""),
+    )
+
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse *argv* with the cached parser and return the arguments."""
+    parser = _build_parser()
+    parser.set_defaults(**_env_defaults())
     args = parser.parse_args(argv)
 
     chosen = sum(bool(x) for x in [args.docker, args.compose, args.compose_all, args.service, args.file])
@@ -69,9 +105,33 @@ def parse_args(argv=None) -> argparse.Namespace:
     return args
 
 
-def main(argv=None) -> None:
-    """Entry point: read logs, cluster patterns, report results, notify."""
+def _incremental_since(baseline_path: Path, source: str, since: str, now: int) -> Optional[int]:
+    """Return the epoch to fetch logs from for an ``--incremental`` run.
+
+    That is the start time of the previous run of the same *source*, when
+    it falls inside the ``--since`` window.  Returns ``None`` (use
+    ``--since`` as given) on the first run of *source*, or when ``--since``
+    isn't a plain duration like ``"1h"``.
+    """
+    last_run = BaselineState.load(baseline_path).last_run.get(source)
+    if not last_run:
+        return None
+    try:
+        window_start = now - parse_duration(since)
+    except ValueError:
+        return None
+    return last_run if last_run > window_start else None
+
+
+def main(argv=None, out: Optional[TextIO] = None) -> None:
+    """Entry point: read logs, cluster patterns, report results, notify.
+
+    Normal output (the report and status messages) goes to *out*, which
+    defaults to stdout; errors always go to stderr.
+    """
     args = parse_args(argv)
+    if out is None:
+        out = sys.stdout
 
     db_path = Path(args.state_db)
     baseline_path = Path(args.baseline_state)
@@ -79,7 +139,7 @@ def main(argv=None) -> None:
     if args.reset:
         PatternDB(db_path).reset()
         BaselineState.reset(baseline_path)
-        print(f"Reset: removed {db_path} and {baseline_path}")
+        print(f"Reset: removed {db_path} and {baseline_path}", file=out)
         return
 
     if args.baseline_learn:
@@ -89,15 +149,21 @@ def main(argv=None) -> None:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(2)
         until = BaselineState.enable_learning(baseline_path, seconds)
-        print(f"Baseline learning enabled until {fmt_local_ts(until)}. (No alerts during this period)")
+        print(f"Baseline learning enabled until {fmt_local_ts(until)}. (No alerts during this period)", file=out)
+
+    started = now_epoch()
+    since_epoch = None
+    if args.incremental:
+        since_epoch = _incremental_since(baseline_path, describe_source(args), args.since, started)
 
+    # Lines are clustered as the source yields them, so source errors can
+    # surface from either call
     try:
-        lines, src_desc = read_lines(args)
+        lines, src_desc = read_lines(args, since_epoch)
+        window = cluster(lines)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(2)
-
-    window = cluster(lines)
     report, alerted_items, baseline_active = build_report(
         src_desc=src_desc,
         since=args.since,
@@ -108,15 +174,22 @@ def main(argv=None) -> None:
         show_new_only=args.show_new,
         min_severity=args.min_severity,
     )
+    if args.incremental:
+        BaselineState.record_run(baseline_path, src_desc, started)
 
     if args.json:
-        print(report_to_json(report))
+        write_report_json(report, out)
+        out.write("\n")
     else:
-        print_text_report(report, show_samples=args.show_samples)
+        print_text_report(report, show_samples=args.show_samples, file=out)
 
     if baseline_active or not alerted_items:
         return
 
+    # Imported lazily: the notifiers pull in requests and smtplib, which
+    # dominate CLI start-up time and are only needed when alerting
+    from .notify.dispatch import dispatch_notifications
+
     alert_msg = format_alert_message(report, alerted_items)
     failures = dispatch_notifications(args, alert_msg)
     if failures:
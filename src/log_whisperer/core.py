@@ -8,6 +8,7 @@ NEW/seen tags and optional alert items for notification dispatch.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
@@ -20,6 +21,9 @@ from .report import Report, ReportItem
 @dataclass
 class WindowPattern:
     """Aggregated pattern data from the current analysis window (one run)."""
+    # Explicit slots (dataclass(slots=True) needs Python 3.10)
+    __slots__ = ("h", "pattern", "count", "severity", "sample")
+
     h: str
     pattern: str
     count: int
@@ -27,38 +31,72 @@ class WindowPattern:
     sample: str
 
 
+# Raw-line cache used by cluster(): how many lines to sample before deciding
+# whether lines repeat enough to be worth caching, the minimum number of
+# repeats among them, and the most raw lines ever cached
+_RAW_CACHE_PROBE = 1024
+_RAW_CACHE_MIN_HITS = _RAW_CACHE_PROBE // 10
+_RAW_CACHE_MAX = 4096
+
+
 def cluster(lines: Iterable[str]) -> Dict[str, WindowPattern]:
     """Normalize and group raw log lines into deduplicated patterns.
 
-    Each unique normalized pattern gets a count, severity, and one raw
-    sample line. Returns a dict keyed by pattern hash.
+    *lines* are expected without line terminators, as produced by the
+    sources.  Each unique normalized pattern gets a count, severity, and
+    one raw sample line. Returns a dict keyed by pattern hash.  Severity is
+    classified once per unique pattern, on its first occurrence.
+
+    Repeated raw lines (common for sources without timestamps, such as
+    ``journalctl -o cat``) are normalized and hashed only once, via a
+    cache of at most ``_RAW_CACHE_MAX`` lines.  The cache is dropped after
+    the first ``_RAW_CACHE_PROBE`` lines if too few of them repeated, so
+    timestamped (all-distinct) input streams through at constant memory.
     """
-    counts: Dict[str, int] = {}
-    patterns: Dict[str, str] = {}
-    samples: Dict[str, str] = {}
-    severities: Dict[str, str] = {}
+    window: Dict[str, WindowPattern] = {}
 
-    for raw in lines:
-        raw = raw.rstrip("\n")
+    def add(raw: str) -> str:
+        """Count *raw* in the window; return its hash ("" if it's blank)."""
         pat = normalize_line(raw)
         if not pat:
-            continue
+            return ""
         h = pattern_hash(pat)
-        counts[h] = counts.get(h, 0) + 1
-        patterns[h] = pat
-        samples.setdefault(h, raw)  # keep the first occurrence as sample
-        severities[h] = severity_of(pat)
-
-    out: Dict[str, WindowPattern] = {}
-    for h, c in counts.items():
-        out[h] = WindowPattern(
-            h=h,
-            pattern=patterns[h],
-            count=c,
-            severity=severities[h],
-            sample=samples[h],
-        )
-    return out
+        wp = window.get(h)
+        if wp is None:
+            # First occurrence: keep the raw line as sample
+            window[h] = WindowPattern(h=h, pattern=pat, count=1, severity=severity_of(pat), sample=raw)
+        else:
+            wp.count += 1
+        return h
+
+    it = iter(lines)
+    # raw line -> pattern hash ("" for lines that normalize to nothing)
+    raw_hashes: Dict[str, str] = {}
+    hits = 0
+    for raw in islice(it, _RAW_CACHE_PROBE):
+        h = raw_hashes.get(raw)
+        if h is None:
+            raw_hashes[raw] = add(raw)
+        else:
+            hits += 1
+            if h:
+                window[h].count += 1
+
+    if hits < _RAW_CACHE_MIN_HITS:
+        raw_hashes.clear()
+        for raw in it:
+            add(raw)
+        return window
+
+    for raw in it:
+        h = raw_hashes.get(raw)
+        if h is None:
+            h = add(raw)
+            if len(raw_hashes) < _RAW_CACHE_MAX:
+                raw_hashes[raw] = h
+        elif h:
+            window[h].count += 1
+    return window
 
 
 def build_report(
@@ -75,7 +113,8 @@ def build_report(
 
     For each pattern in the window:
       1. Check if it already exists in the DB (seen vs NEW).
-      2. Update cumulative counts in the DB regardless of filters.
+      2. Update cumulative counts in the DB regardless of filters (only
+         the window's records are written back).
       3. Build report items honoring ``show_new_only`` and ``min_severity``.
       4. Collect alert-worthy items (NEW patterns outside baseline mode).
 
@@ -83,7 +122,7 @@ def build_report(
         A 3-tuple of (report, alerted_items, baseline_active).
     """
     db = PatternDB(db_path)
-    records = db.load()
+    records = db.load_subset(window.keys())
     now = now_epoch()
 
     baseline = BaselineState.load(baseline_path)
@@ -92,13 +131,9 @@ def build_report(
     severity_rank = {"INFO": 0, "WARN": 1, "ERROR": 2}
     min_rank = severity_rank.get(min_severity, 0)
 
-    # Show highest-count patterns first in the report
-    items_sorted = sorted(window.values(), key=lambda w: w.count, reverse=True)
-
     report_items: List[ReportItem] = []
-    alerted_items: List[ReportItem] = []
 
-    for w in items_sorted:
+    for w in window.values():
         old = records.get(w.h)
         is_new = old is None
 
@@ -160,14 +195,16 @@ def build_report(
             hash=w.h,
         )
         report_items.append(item)
+        records[w.h] = rec
 
-        # Only alert on NEW patterns when baseline learning is inactive
-        if (not baseline_active) and (tag == "NEW"):
-            alerted_items.append(item)
+    # Show highest-count patterns first; only the reported items are sorted
+    report_items.sort(key=lambda it: it.count_window, reverse=True)
 
-        records[w.h] = rec
+    # Only alert on NEW patterns when baseline learning is inactive
+    alerted_items = [] if baseline_active else [it for it in report_items if it.tag == "NEW"]
 
-    db.save(records)
+    # Every window pattern was touched; append just those to the DB log
+    db.append(records[h] for h in window)
 
     report = Report(
         source=src_desc,
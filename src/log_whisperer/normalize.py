@@ -4,23 +4,40 @@ The normalizer strips timestamp prefixes and substitutes runtime-specific
 values (IPs, UUIDs, hex literals, file paths, bare numbers) so that
 structurally identical log lines collapse into a single pattern string.
 
-Substitution order matters: UUIDs and long hashes are matched before the
-generic number regex to avoid partial replacements.
+All variable-data patterns are combined into one alternation so a line is
+scanned once.  Alternative order matters: at any position UUIDs and long
+hashes are tried before the generic number regex to avoid partial
+replacements.  Each replaced token is consumed, so tokens that overlap it
+(IDs inside a path, an IP run onto a MAC address) are not matched again.
 """
 
 from __future__ import annotations
 
-import hashlib
 import re
+from functools import lru_cache
+from hashlib import blake2b
+
+# --- Variable-data patterns (tried in this order at each position) ---------
+# The leading lookahead lists every character an alternative can start with,
+# letting the engine reject most positions with one check instead of
+# trying all seven alternatives.
+_VARIABLE_RE = re.compile(
+    r"(?=[\da-f/])(?:"
+    r"(?P<UUID>\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b)"
+    r"|(?P<HASH>\b[0-9a-f]{32,64}\b)"
+    r"|(?P<IP>\b(?:\d{1,3}\.){3}\d{1,3}\b)"
+    r"|(?P<MAC>\b(?:[0-9a-f]{2}:){5}[0-9a-f]{2}\b)"
+    r"|(?P<HEX>\b0x[0-9a-f]+\b)"
+    r"|(?P<PATH>(?:/[A-Za-z0-9._-]+)+)"
+    r"|(?P<N>\b\d+\b))",
+    re.I,
+)
+_PLACEHOLDERS = {name: f"<{name}>" for name in _VARIABLE_RE.groupindex}
+
+
+def _placeholder(m: re.Match) -> str:
+    return _PLACEHOLDERS[m.lastgroup]
 
-# --- Variable-data patterns (matched in this order) --------------------------
-_UUID_RE = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I)
-_HASH_RE = re.compile(r"\b[0-9a-f]{32,64}\b", re.I)
-_IP_RE = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
-_MAC_RE = re.compile(r"\b(?:[0-9a-f]{2}:){5}[0-9a-f]{2}\b", re.I)
-_HEX_RE = re.compile(r"\b0x[0-9a-f]+\b", re.I)
-_NUM_RE = re.compile(r"\b\d+\b")
-_PATH_RE = re.compile(r"(?:/[A-Za-z0-9._-]+)+")
 
 # --- Timestamp prefixes to strip before normalizing --------------------------
 _SYSLOG_PREFIX_RE = re.compile(r"^[A-Z][a-z]{2}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}\s+[^ ]+\s+[^:]+:\s*")
@@ -36,24 +53,29 @@ def normalize_line(line: str) -> str:
     if not line:
         return ""
 
-    # Strip leading timestamp so it doesn't affect pattern identity
-    line = _SYSLOG_PREFIX_RE.sub("", line)
-    line = _ISO_TS_PREFIX_RE.sub("", line)
+    # Strip leading timestamp so it doesn't affect pattern identity.  The
+    # character checks are implied by each regex, so lines without a
+    # timestamp skip the regex engine entirely.
+    if "A" <= line[0] <= "Z" and line[3:4].isspace():
+        line = _SYSLOG_PREFIX_RE.sub("", line, count=1)
+    if line[4:5] == "-" and line[:1].isdigit():
+        line = _ISO_TS_PREFIX_RE.sub("", line, count=1)
 
-    # Replace specific types before generic numbers to avoid partial matches
-    line = _UUID_RE.sub("<UUID>", line)
-    line = _HASH_RE.sub("<HASH>", line)
-    line = _IP_RE.sub("<IP>", line)
-    line = _MAC_RE.sub("<MAC>", line)
-    line = _HEX_RE.sub("<HEX>", line)
-    line = _PATH_RE.sub("<PATH>", line)
-    line = _NUM_RE.sub("<N>", line)
+    # One pass over the line; the alternation order picks specific types
+    # before generic numbers
+    line = _VARIABLE_RE.sub(_placeholder, line)
 
     # Collapse whitespace runs into a single space
-    line = re.sub(r"\s+", " ", line).strip()
+    line = " ".join(line.split())
     return line
 
 
+@lru_cache(maxsize=4096)
 def pattern_hash(pattern: str) -> str:
-    """Return a stable SHA-1 hex digest for a normalized pattern string."""
-    return hashlib.sha1(pattern.encode("utf-8")).hexdigest()
+    """Return a stable 128-bit BLAKE2b hex digest for a normalized pattern string.
+
+    The hash is an identifier, not a security boundary, so the fast
+    BLAKE2b is used.  Results are cached because many lines collapse to
+    the same pattern.
+    """
+    return blake2b(pattern.encode("utf-8"), digest_size=16).hexdigest()
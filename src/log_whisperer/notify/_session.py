@@ -0,0 +1,21 @@
+"""Shared HTTP session used by the ntfy and Telegram notifiers.
+
+A single ``requests.Session`` keeps connections alive between requests so
+repeated alerts to the same host skip the TCP/TLS handshake.  Pooled
+connections are closed at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+session = requests.Session()
+
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+atexit.register(session.close)
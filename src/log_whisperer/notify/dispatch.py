@@ -1,13 +1,17 @@
 """Fan-out notification dispatcher.
 
 Checks CLI args / env vars for each configured channel (ntfy, Telegram,
-email) and sends the alert message to all that are configured.  Failures
-are collected rather than raised so one broken channel doesn't block others.
+email) and sends the alert message to all that are configured.  Channels
+are sent concurrently, so total latency is that of the slowest channel
+rather than the sum of all of them.  Failures are collected rather than
+raised so one broken channel doesn't block others.
 """
 
 from __future__ import annotations
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List, Tuple
 
 from .ntfy import notify_ntfy
 from .telegram import notify_telegram
@@ -17,40 +21,40 @@ from .email_smtp import notify_email_smtp
 def dispatch_notifications(args, message: str) -> List[str]:
     """Send *message* to every notification channel configured in *args*.
 
+    *args* is the ``argparse.Namespace`` from :func:`~log_whisperer.cli.parse_args`,
+    so every ``notify_*`` attribute is present (possibly empty).
+
     Returns a list of human-readable failure descriptions (empty on success).
-    Each channel is attempted independently — a failure in one does not
-    prevent delivery to the others.
+    Each channel is attempted independently in its own worker thread — a
+    failure in one does not prevent delivery to the others.  Failures are
+    reported in channel order (ntfy, telegram, email).
     """
-    failures: List[str] = []
+    tasks: List[Tuple[str, Callable[[], None]]] = []
 
-    if getattr(args, "notify_ntfy_topic", ""):
-        try:
-            notify_ntfy(
+    if args.notify_ntfy_topic:
+        tasks.append((
+            "ntfy",
+            partial(
+                notify_ntfy,
                 topic=args.notify_ntfy_topic,
                 message=message,
                 server=args.notify_ntfy_server,
                 title="Log Whisperer Alert",
-            )
-        except Exception as e:
-            failures.append(f"ntfy: {e}")
+            ),
+        ))
 
-    if getattr(args, "notify_telegram_token", "") and getattr(args, "notify_telegram_chat_id", ""):
-        try:
-            notify_telegram(args.notify_telegram_token, args.notify_telegram_chat_id, message)
-        except Exception as e:
-            failures.append(f"telegram: {e}")
+    if args.notify_telegram_token and args.notify_telegram_chat_id:
+        tasks.append((
+            "telegram",
+            partial(notify_telegram, args.notify_telegram_token, args.notify_telegram_chat_id, message),
+        ))
 
     # Email requires at minimum a host, sender, and recipient
-    email_ready = all(
-        [
-            getattr(args, "notify_email_host", ""),
-            getattr(args, "notify_email_from", ""),
-            getattr(args, "notify_email_to", ""),
-        ]
-    )
-    if email_ready:
-        try:
-            notify_email_smtp(
+    if args.notify_email_host and args.notify_email_from and args.notify_email_to:
+        tasks.append((
+            "email",
+            partial(
+                notify_email_smtp,
                 host=args.notify_email_host,
                 port=args.notify_email_port,
                 username=args.notify_email_user,
@@ -60,8 +64,19 @@ def dispatch_notifications(args, message: str) -> List[str]:
                 subject="Log Whisperer Alert: New log patterns detected",
                 body=message,
                 use_tls=not args.notify_email_no_tls,
-            )
-        except Exception as e:
-            failures.append(f"email: {e}")
+            ),
+        ))
+
+    failures: List[str] = []
+    if not tasks:
+        return failures
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        futures = [(name, pool.submit(send)) for name, send in tasks]
+        for name, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                failures.append(f"{name}: {e}")
 
     return failures
@@ -1,9 +1,95 @@
-"""Send alert emails via SMTP (with optional STARTTLS)."""
+"""Send alert emails via SMTP (with optional STARTTLS).
+
+Authenticated connections are kept in a small process-wide pool so
+back-to-back alerts skip the connect / STARTTLS / AUTH round-trips.
+Idle or stale connections are transparently replaced.
+"""
 
 from __future__ import annotations
 
+import atexit
 import smtplib
+import threading
+import time
 from email.message import EmailMessage
+from typing import Dict, Tuple
+
+_PoolKey = Tuple[str, int, str, bool]
+
+
+def _connect(host: str, port: int, username: str, password: str, use_tls: bool) -> smtplib.SMTP:
+    """Open a new SMTP connection, upgrading to TLS and logging in as needed."""
+    s = smtplib.SMTP(host, port, timeout=15)
+    try:
+        if use_tls:
+            s.starttls()
+        if username:
+            s.login(username, password)
+    except Exception:
+        _close(s)
+        raise
+    return s
+
+
+def _close(conn: smtplib.SMTP) -> None:
+    """Politely close *conn*, ignoring errors from an already-dead socket."""
+    try:
+        conn.quit()
+    except (smtplib.SMTPException, OSError):
+        conn.close()
+
+
+class _SmtpPool:
+    """Process-lifetime cache of open SMTP connections.
+
+    Connections are keyed by ``(host, port, username, use_tls)``.  A
+    connection is handed out exclusively by :meth:`acquire` and returned
+    with :meth:`release`.  On acquire, connections idle for longer than
+    *idle_timeout* seconds or failing a ``NOOP`` probe are replaced.
+    """
+
+    def __init__(self, idle_timeout: float = 30.0) -> None:
+        self.idle_timeout = idle_timeout
+        self._conns: Dict[_PoolKey, Tuple[smtplib.SMTP, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str, port: int, username: str, password: str, use_tls: bool) -> smtplib.SMTP:
+        """Return a ready-to-use connection, reusing a pooled one if healthy."""
+        with self._lock:
+            entry = self._conns.pop((host, port, username, use_tls), None)
+        if entry is not None:
+            conn, last_used = entry
+            if time.monotonic() - last_used <= self.idle_timeout and self._is_alive(conn):
+                return conn
+            _close(conn)
+        return _connect(host, port, username, password, use_tls)
+
+    def release(self, key: _PoolKey, conn: smtplib.SMTP) -> None:
+        """Return *conn* to the pool for reuse under *key*."""
+        with self._lock:
+            previous = self._conns.get(key)
+            self._conns[key] = (conn, time.monotonic())
+        if previous is not None:
+            _close(previous[0])
+
+    def close_all(self) -> None:
+        """Close every pooled connection (registered with ``atexit``)."""
+        with self._lock:
+            conns = [conn for conn, _ in self._conns.values()]
+            self._conns.clear()
+        for conn in conns:
+            _close(conn)
+
+    @staticmethod
+    def _is_alive(conn: smtplib.SMTP) -> bool:
+        try:
+            return conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+
+_pool = _SmtpPool()
+atexit.register(_pool.close_all)
 
 
 def notify_email_smtp(
@@ -20,7 +106,9 @@ def notify_email_smtp(
     """Send a plain-text email from *sender* to *recipient* via SMTP.
 
     Connects to *host*:*port*, optionally upgrades to TLS with STARTTLS,
-    and authenticates if *username* is non-empty.
+    and authenticates if *username* is non-empty.  The connection is kept
+    open in the pool afterwards; if the server dropped a pooled connection,
+    the send is retried once on a fresh one.
     """
     msg = EmailMessage()
     msg["From"] = sender
@@ -28,9 +116,18 @@ def notify_email_smtp(
     msg["Subject"] = subject
     msg.set_content(body)
 
-    with smtplib.SMTP(host, port, timeout=15) as s:
-        if use_tls:
-            s.starttls()
-        if username:
-            s.login(username, password)
-        s.send_message(msg)
+    key = (host, port, username, use_tls)
+    for attempt in range(2):
+        conn = _pool.acquire(host, port, username, password, use_tls)
+        try:
+            conn.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPSenderRefused):
+            _close(conn)
+            if attempt:
+                raise
+            continue
+        except Exception:
+            _close(conn)
+            raise
+        _pool.release(key, conn)
+        return
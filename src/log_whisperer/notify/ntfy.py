@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import requests
+from ._session import session
 
 
 def notify_ntfy(topic: str, message: str, server: str = "https://ntfy.sh", title: str = "Log Whisperer") -> None:
@@ -13,5 +13,5 @@ def notify_ntfy(topic: str, message: str, server: str = "https://ntfy.sh", title
     """
     url = f"{server.rstrip('/')}/{topic}"
     headers = {"Title": title}
-    r = requests.post(url, data=message.encode("utf-8"), headers=headers, timeout=10)
+    r = session.post(url, data=message.encode("utf-8"), headers=headers, timeout=10)
     r.raise_for_status()
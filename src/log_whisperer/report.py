@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-import json
+import sys
 import time
-from dataclasses import dataclass, asdict
-from typing import List
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, TextIO
+
+from ._json import dumps_compact, dumps_pretty
 
 
 @dataclass
@@ -19,8 +21,10 @@ class ReportItem:
         severity: Classified severity level.
         pattern: Normalized pattern string with placeholders.
         sample: One raw log line that produced this pattern.
-        hash: SHA-1 hash identifying this pattern.
+        hash: BLAKE2b hash identifying this pattern.
     """
+    __slots__ = ("tag", "count_window", "total_seen", "severity", "pattern", "sample", "hash")
+
     tag: str
     count_window: int
     total_seen: int
@@ -29,8 +33,20 @@ class ReportItem:
     sample: str
     hash: str
 
+    def to_dict(self) -> dict:
+        """Serialize to a plain dict for JSON encoding (no deep copy)."""
+        return {
+            "tag": self.tag,
+            "count_window": self.count_window,
+            "total_seen": self.total_seen,
+            "severity": self.severity,
+            "pattern": self.pattern,
+            "sample": self.sample,
+            "hash": self.hash,
+        }
 
-@dataclass
+
+@dataclass(frozen=True)
 class Report:
     """Top-level report container with metadata and pattern items."""
     source: str
@@ -42,31 +58,87 @@ class Report:
     generated_at: int
     items: List[ReportItem]
 
+    def to_dict(self) -> dict:
+        """Serialize to a plain dict for JSON encoding.
+
+        Equivalent to ``dataclasses.asdict`` but builds the dicts directly
+        instead of recursively deep-copying every field.
+        """
+        return {
+            "source": self.source,
+            "since": self.since,
+            "lines_limit": self.lines_limit,
+            "state_db": self.state_db,
+            "baseline_active": self.baseline_active,
+            "baseline_until": self.baseline_until,
+            "generated_at": self.generated_at,
+            "items": [it.to_dict() for it in self.items],
+        }
 
-def print_text_report(report: Report, show_samples: bool) -> None:
-    """Print a human-readable report to stdout."""
-    print("\n=== Log Whisperer Report ===")
-    print(f"Source: {report.source} | since={report.since} | lines<={report.lines_limit}")
-    print(f"State: {report.state_db}")
+
+def print_text_report(report: Report, show_samples: bool, file: Optional[TextIO] = None) -> None:
+    """Print a human-readable report to *file* (default: stdout).
+
+    The report is assembled first and written with a single call, rather
+    than one ``print`` (and possibly one flush) per line.
+    """
+    out: List[str] = [
+        "",
+        "=== Log Whisperer Report ===",
+        f"Source: {report.source} | since={report.since} | lines<={report.lines_limit}",
+        f"State: {report.state_db}",
+    ]
 
     if report.baseline_active:
         until = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(report.baseline_until))
-        print(f"Baseline: ACTIVE (learning) until {until}")
-    print()
+        out.append(f"Baseline: ACTIVE (learning) until {until}")
+    out.append("")
 
     if not report.items:
-        print("No patterns to show.")
-        print("\nTip: use --show-new to only display never-seen patterns.")
-        return
+        out.append("No patterns to show.")
 
     for it in report.items:
-        print(f"[{it.tag}][{it.severity}] x{it.count_window:<5} total={it.total_seen:<7}  {it.pattern}")
+        out.append(f"[{it.tag}][{it.severity}] x{it.count_window:<5} total={it.total_seen:<7}  {it.pattern}")
         if show_samples:
-            print(f"  sample: {it.sample}")
+            out.append(f"  sample: {it.sample}")
 
-    print("\nTip: use --show-new to only display never-seen patterns.")
+    out.append("")
+    out.append("Tip: use --show-new to only display never-seen patterns.")
+    (file or sys.stdout).write("\n".join(out) + "\n")
 
 
 def report_to_json(report: Report) -> str:
     """Serialize the full report to a pretty-printed JSON string."""
-    return json.dumps(asdict(report), indent=2)
+    return dumps_pretty(report.to_dict())
+
+
+def iter_report_json(report: Report) -> Iterator[str]:
+    """Yield the text of :func:`report_to_json` in chunks, item by item.
+
+    Only one item is converted to a dict and encoded at a time, so large
+    reports never need a full dict tree or one big string in memory.  The
+    concatenated chunks are identical to ``report_to_json(report)``.
+    """
+    meta = report.to_dict()
+    del meta["items"]
+    yield "{\n"
+    for key, value in meta.items():
+        yield f"  {dumps_compact(key)}: {dumps_compact(value)},\n"
+
+    if not report.items:
+        yield '  "items": []\n}'
+        return
+    yield '  "items": [\n'
+    last = len(report.items) - 1
+    for i, it in enumerate(report.items):
+        # Re-indent the item's own two-space layout to sit inside the list;
+        # newlines inside JSON strings are escaped, so this is safe
+        yield "    " + dumps_pretty(it.to_dict()).replace("\n", "\n    ")
+        yield ",\n" if i < last else "\n"
+    yield "  ]\n}"
+
+
+def write_report_json(report: Report, fp: TextIO) -> None:
+    """Write the pretty-printed JSON report to *fp* without buffering it whole."""
+    for chunk in iter_report_json(report):
+        fp.write(chunk)
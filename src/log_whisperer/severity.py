@@ -6,6 +6,8 @@ Returns ``"ERROR"``, ``"WARN"``, or ``"INFO"`` (the default).
 
 from __future__ import annotations
 
+from typing import Tuple
+
 ERROR_HINTS = (
     "error",
     "fatal",
@@ -32,11 +34,28 @@ WARN_HINTS = (
 )
 
 
+def _minimal(hints: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Drop hints that contain another hint (e.g. "warning" contains "warn").
+
+    Any line matching the longer hint also matches the shorter one, so
+    only the shorter one needs to be searched for.
+    """
+    return tuple(h for h in hints if not any(o != h and o in h for o in hints))
+
+
+_ERROR_SCAN = _minimal(ERROR_HINTS)
+_WARN_SCAN = _minimal(WARN_HINTS)
+
+
 def severity_of(text: str) -> str:
     """Classify *text* as ``"ERROR"``, ``"WARN"``, or ``"INFO"``."""
     t = text.lower()
-    if any(h in t for h in ERROR_HINTS):
-        return "ERROR"
-    if any(h in t for h in WARN_HINTS):
-        return "WARN"
+    # Plain loops: `in` on str is a C-level search, and unlike any() over a
+    # generator this creates no frame per call
+    for h in _ERROR_SCAN:
+        if h in t:
+            return "ERROR"
+    for h in _WARN_SCAN:
+        if h in t:
+            return "WARN"
     return "INFO"
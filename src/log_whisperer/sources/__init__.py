@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Iterable, Optional, Tuple
 
 from .docker import read_docker
 from .compose import read_compose, read_compose_all
@@ -10,30 +10,60 @@ from .journal import read_journal
 from .file import read_file
 
 
-def read_lines(args) -> Tuple[List[str], str]:
+def describe_source(args) -> str:
+    """Return the source description for *args*, e.g. ``"docker:myapp"``.
+
+    This is the same string :func:`read_lines` returns, available before
+    any logs are read.
+
+    Raises:
+        RuntimeError: If no source flag was set on *args*.
+    """
+    if args.docker:
+        return f"docker:{args.docker}"
+    if args.compose:
+        return f"compose:{args.compose}"
+    if args.compose_all:
+        return "compose:all"
+    if args.service:
+        return f"journal:{args.service}"
+    if args.file:
+        return f"file:{args.file}"
+    raise RuntimeError("No log source provided.")
+
+
+def read_lines(args, since_epoch: Optional[int] = None) -> Tuple[Iterable[str], str]:
     """Dispatch to the correct log source based on parsed CLI arguments.
 
+    If *since_epoch* is given, docker/compose/journal sources fetch logs
+    from that Unix timestamp instead of ``args.since``.  File sources
+    ignore both.
+
     Returns:
-        A tuple of ``(lines, source_description)`` where *lines* is a list
-        of raw log strings and *source_description* identifies the source
-        for report metadata (e.g. ``"docker:myapp"``).
+        A tuple of ``(lines, source_description)`` where *lines* is an
+        iterable of raw log strings, to be consumed once, and
+        *source_description* identifies the source for report metadata
+        (e.g. ``"docker:myapp"``).  Sources may read lazily, so errors can
+        also surface while *lines* is being iterated.
 
     Raises:
         RuntimeError: If no source flag was set on *args*.
     """
+    desc = describe_source(args)
+    since = args.since if since_epoch is None else str(since_epoch)
+
     if args.docker:
-        return read_docker(args.docker, args.since, args.lines), f"docker:{args.docker}"
+        return read_docker(args.docker, since, args.lines), desc
 
     if args.compose:
-        return read_compose(args.compose, args.since, args.lines), f"compose:{args.compose}"
+        return read_compose(args.compose, since, args.lines), desc
 
     if args.compose_all:
-        return read_compose_all(args.since, args.lines), "compose:all"
+        return read_compose_all(since, args.lines), desc
 
     if args.service:
-        return read_journal(args.service, args.since, args.lines), f"journal:{args.service}"
-
-    if args.file:
-        return read_file(args.file, args.lines), f"file:{args.file}"
+        # journalctl wants "@<epoch>" for Unix timestamps
+        journal_since = args.since if since_epoch is None else f"@{since_epoch}"
+        return read_journal(args.service, journal_since, args.lines), desc
 
-    raise RuntimeError("No log source provided.")
+    return read_file(args.file, args.lines), desc
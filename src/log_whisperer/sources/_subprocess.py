@@ -1,4 +1,4 @@
-"""Shared subprocess helper used by docker, compose, and journal sources.
+"""Shared subprocess helpers used by docker, compose, and journal sources.
 
 Centralises command execution so error handling (missing binary, non-zero
 exit) is consistent and not duplicated across source modules.
@@ -7,31 +7,116 @@ exit) is consistent and not duplicated across source modules.
 from __future__ import annotations
 
 import subprocess
-from typing import List
+import tempfile
+from collections import deque
+from typing import IO, Iterator, List
 
+# Lines of merged output quoted in the error when a streamed command fails
+_ERROR_CONTEXT_LINES = 20
 
-def run_cmd(cmd: List[str], *, merge_stderr: bool = False) -> str:
-    """Run *cmd* and return its stdout as a string.
+
+def run_cmd_tail(cmd: List[str], limit: int, *, merge_stderr: bool = False) -> List[str]:
+    """Run *cmd* and return the last *limit* lines of its stdout.
+
+    Output is read line by line as the child produces it and only the
+    last *limit* lines are kept, so memory stays bounded no matter how
+    much the command prints.  Lines are kept as raw bytes and only the
+    kept ones are decoded (UTF-8, invalid bytes replaced).  As in text
+    mode, ``\\n``, ``\\r\\n`` and a lone ``\\r`` all end a line, and line
+    terminators are stripped.
 
     Args:
         cmd: Command and arguments to execute.
+        limit: Maximum number of trailing lines to return.
         merge_stderr: If *True*, stderr is merged into stdout so that
-            both streams are included in the returned string.
+            both streams are included in the returned lines.
 
     Raises:
         RuntimeError: If the executable is not found or exits non-zero.
     """
+    # stderr goes to a temp file rather than a pipe so a chatty child
+    # can't block on a full stderr pipe while we drain stdout
+    with tempfile.TemporaryFile() as err:
+        try:
+            p = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT if merge_stderr else err,
+            )
+        except FileNotFoundError:
+            raise RuntimeError(f"Command not found: {cmd[0]}")
+        with p:
+            tail = deque((line for raw in p.stdout for line in _split_lines(raw)), maxlen=limit)
+        lines = [line.decode("utf-8", errors="replace") for line in tail]
+        if p.returncode != 0:
+            if merge_stderr:
+                msg = "\n".join(lines).strip()
+            else:
+                err.seek(0)
+                msg = err.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"Command failed ({p.returncode}): {' '.join(cmd)}\n{msg}")
+    return lines
+
+
+def iter_cmd(cmd: List[str], *, merge_stderr: bool = False) -> Iterator[str]:
+    """Run *cmd* and yield its stdout lines as the child produces them.
+
+    For commands that already limit their own output (``docker logs
+    --tail``), so lines can be processed while the command is still
+    running instead of after it exits.  Decoding and line splitting are
+    handled as in :func:`run_cmd_tail`.
+
+    Raises:
+        RuntimeError: Immediately if the executable is not found; from the
+            iterator, after the last line, if it exits non-zero.
+    """
+    err = tempfile.TemporaryFile()
     try:
-        p = subprocess.run(
+        p = subprocess.Popen(
             cmd,
-            check=False,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
-            text=True,
+            stderr=subprocess.STDOUT if merge_stderr else err,
         )
     except FileNotFoundError:
+        err.close()
         raise RuntimeError(f"Command not found: {cmd[0]}")
-    if p.returncode != 0:
-        err = p.stdout.strip() if merge_stderr else p.stderr.strip()
-        raise RuntimeError(f"Command failed ({p.returncode}): {' '.join(cmd)}\n{err}")
-    return p.stdout
+    return _iter_output(cmd, p, err, merge_stderr)
+
+
+def _iter_output(cmd: List[str], p: subprocess.Popen, err: IO[bytes], merge_stderr: bool) -> Iterator[str]:
+    """Yield decoded lines from *p*, then raise if it failed."""
+    # With stderr merged, the error message is the last few output lines
+    recent: deque = deque(maxlen=_ERROR_CONTEXT_LINES)
+    try:
+        for raw in p.stdout:
+            for part in _split_lines(raw):
+                line = part.decode("utf-8", errors="replace")
+                recent.append(line)
+                yield line
+        if p.wait() != 0:
+            if merge_stderr:
+                msg = "\n".join(recent).strip()
+            else:
+                err.seek(0)
+                msg = err.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"Command failed ({p.returncode}): {' '.join(cmd)}\n{msg}")
+    finally:
+        # The consumer may stop early; don't leave the child blocked on a full pipe
+        if p.poll() is None:
+            p.kill()
+        p.stdout.close()
+        p.wait()
+        err.close()
+
+
+def _split_lines(raw: bytes) -> List[bytes]:
+    """Split one ``\\n``-terminated chunk of output into lines.
+
+    Binary reads only break on ``\\n``; this also breaks on a lone ``\\r``,
+    matching the universal-newlines splitting of a text-mode read.
+    """
+    if raw.endswith(b"\n"):
+        raw = raw[:-1]
+    if raw.endswith(b"\r"):
+        raw = raw[:-1]
+    return raw.split(b"\r")
@@ -4,16 +4,26 @@ from __future__ import annotations
 
 from typing import List
 
-from ._subprocess import run_cmd
+from ._subprocess import run_cmd_tail
 
 
 def read_compose(service: str, since: str, limit: int) -> List[str]:
     """Fetch the last *limit* log lines from a single Compose *service*."""
-    out = run_cmd(["docker", "compose", "logs", "--since", since, "--no-color", service], merge_stderr=True)
-    return out.splitlines()[-limit:]
+    return run_cmd_tail(
+        ["docker", "compose", "logs", "--since", since, "--tail", str(limit), "--no-color", service],
+        limit,
+        merge_stderr=True,
+    )
 
 
 def read_compose_all(since: str, limit: int) -> List[str]:
-    """Fetch the last *limit* log lines from all Compose services."""
-    out = run_cmd(["docker", "compose", "logs", "--since", since, "--no-color"], merge_stderr=True)
-    return out.splitlines()[-limit:]
+    """Fetch the last *limit* log lines from all Compose services.
+
+    ``--tail`` applies per container, so up to *limit* lines per service
+    are sent; the overall tail is still cut to *limit*.
+    """
+    return run_cmd_tail(
+        ["docker", "compose", "logs", "--since", since, "--tail", str(limit), "--no-color"],
+        limit,
+        merge_stderr=True,
+    )
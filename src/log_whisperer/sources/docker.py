@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
-from typing import List
+from itertools import islice
+from typing import Iterator
 
-from ._subprocess import run_cmd
+from ._subprocess import iter_cmd
 
 
-def read_docker(container: str, since: str, limit: int) -> List[str]:
-    """Fetch the last *limit* log lines from *container* since *since*."""
-    out = run_cmd(["docker", "logs", "--since", since, container], merge_stderr=True)
-    return out.splitlines()[-limit:]
+def read_docker(container: str, since: str, limit: int) -> Iterator[str]:
+    """Stream the last *limit* log lines from *container* since *since*.
+
+    ``--tail`` makes Docker send only the lines that will be kept, so they
+    are yielded as they arrive rather than buffered.  A lone ``\\r`` also
+    ends a line, so the stream is capped at *limit* lines in case that
+    splits Docker's lines further.
+    """
+    return islice(
+        iter_cmd(
+            ["docker", "logs", "--since", since, "--tail", str(limit), container],
+            merge_stderr=True,
+        ),
+        limit,
+    )
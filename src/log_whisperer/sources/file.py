@@ -2,17 +2,42 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import List
 
+_BLOCK_SIZE = 64 * 1024
+
 
 def read_file(path: str, limit: int) -> List[str]:
     """Read the last *limit* lines from the file at *path*.
 
+    The file is read in binary mode backwards from the end in fixed-size
+    blocks (like ``tail -n``), stopping once enough lines are found, so
+    only the tail of the file is loaded into memory and decoded.
+
     Raises:
         RuntimeError: If *path* does not exist.
     """
     p = Path(path)
     if not p.exists():
         raise RuntimeError(f"File not found: {p}")
-    return p.read_text(errors="ignore").splitlines()[-limit:]
+    return _tail_lines(p, limit)
+
+
+def _tail_lines(p: Path, limit: int) -> List[str]:
+    """Return the last *limit* lines of *p* by reading blocks from the end."""
+    with open(p, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        blocks: List[bytes] = []
+        newlines = 0
+        # limit + 1 newlines guarantee the first kept line is complete
+        while pos > 0 and newlines <= limit:
+            size = min(_BLOCK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            block = f.read(size)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+    data = b"".join(reversed(blocks))
+    return data.decode(errors="ignore").splitlines()[-limit:]
@@ -4,13 +4,18 @@ from __future__ import annotations
 
 from typing import List
 
-from ._subprocess import run_cmd
+from ._subprocess import run_cmd_tail
 
 
 def read_journal(service: str, since: str, limit: int) -> List[str]:
     """Fetch the last *limit* journal lines for systemd unit *service*.
 
-    Uses ``-o cat`` to output bare log messages without journal metadata.
+    Uses ``-o cat`` to output bare log messages without journal metadata,
+    and ``-n`` so journalctl sends at most *limit* entries.  A multi-line
+    entry (e.g. a traceback) prints several lines, so the output is still
+    cut to its last *limit* lines here.
     """
-    out = run_cmd(["journalctl", "-u", service, "--since", since, "-o", "cat", "--no-pager"])
-    return out.splitlines()[-limit:]
+    return run_cmd_tail(
+        ["journalctl", "-u", service, "--since", since, "-n", str(limit), "-o", "cat", "--no-pager"],
+        limit,
+    )
@@ -2,6 +2,8 @@
 
 The pattern DB uses a JSON-lines format (one JSON object per line) for safe
 storage — no delimiter collision issues unlike pipe-delimited formats.
+Runs append only the records they changed; the log is compacted once stale
+lines outnumber live records.
 File locking via ``fcntl.flock`` prevents corruption when overlapping
 cron-invoked instances read/write the DB concurrently.
 """
@@ -9,12 +11,23 @@ cron-invoked instances read/write the DB concurrently.
 from __future__ import annotations
 
 import fcntl
-import json
+import os
 import re
+import sys
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Dict
+from typing import IO, Dict, Iterable, List, Optional, Set
+
+from ._json import dumps_compact, dumps_pretty, loads, loads_lines
+from .normalize import normalize_line, pattern_hash
+
+# Length of the SHA-1 hex keys written before the switch to BLAKE2b
+_LEGACY_HASH_LEN = 40
+
+# Lines written by this module start with the hash, e.g. '{"h":"<32 hex>",'
+_KEY_PREFIX = '{"h":"'
+_KEY_END = len(_KEY_PREFIX) + 32
 
 
 @dataclass
@@ -22,7 +35,7 @@ class PatternRecord:
     """A single pattern entry stored in the DB.
 
     Attributes:
-        h: SHA-1 hash of the normalized pattern (primary key).
+        h: BLAKE2b hash of the normalized pattern (primary key).
         first_seen: Epoch timestamp when this pattern was first observed.
         last_seen: Epoch timestamp of the most recent observation.
         total_seen: Cumulative count across all analysis runs.
@@ -30,6 +43,8 @@ class PatternRecord:
         pattern: The normalized pattern string (with placeholders).
         sample: One raw log line that matched this pattern.
     """
+    __slots__ = ("h", "first_seen", "last_seen", "total_seen", "severity", "pattern", "sample")
+
     h: str
     first_seen: int
     last_seen: int
@@ -39,8 +54,16 @@ class PatternRecord:
     sample: str
 
     def to_dict(self) -> dict:
-        """Serialize to a plain dict for JSON encoding."""
-        return asdict(self)
+        """Serialize to a plain dict for JSON encoding (no deep copy)."""
+        return {
+            "h": self.h,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "total_seen": self.total_seen,
+            "severity": self.severity,
+            "pattern": self.pattern,
+            "sample": self.sample,
+        }
 
     @staticmethod
     def from_dict(d: dict) -> "PatternRecord":
@@ -50,7 +73,8 @@ class PatternRecord:
             first_seen=int(d["first_seen"]),
             last_seen=int(d["last_seen"]),
             total_seen=int(d["total_seen"]),
-            severity=d["severity"],
+            # Only three distinct values; share one string object for each
+            severity=sys.intern(d["severity"]),
             pattern=d["pattern"],
             sample=d["sample"],
         )
@@ -62,6 +86,11 @@ class PatternDB:
     Each line in the DB file is a self-contained JSON object, making the
     format both human-readable (``jq`` friendly) and resilient to fields
     containing special characters.
+
+    The file is an append-only log: each run appends only the records it
+    changed, and the last line for a given hash wins on load.  Once stale
+    lines outnumber live records the file is compacted back to one line
+    per pattern.
     """
 
     def __init__(self, path: Path) -> None:
@@ -69,52 +98,183 @@ class PatternDB:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         if not self.path.exists():
             self.path.write_text("", encoding="utf-8")
+        # Line count and live hashes as of the last read, used to schedule compaction
+        self._lines = 0
+        self._hashes: Set[str] = set()
+        # Whether the last read re-keyed any legacy SHA-1 records
+        self._legacy = False
 
     def load(self) -> Dict[str, PatternRecord]:
         """Read all pattern records from the DB file.
 
         Acquires a shared lock (``LOCK_SH``) so concurrent readers don't
         block each other but writers wait until all readers finish.
-        Malformed lines are silently skipped.
+        Malformed lines are silently skipped.  Records keyed by a legacy
+        SHA-1 hash are re-keyed from their raw sample line (see ``_rekey``),
+        and the file is then compacted once so they are stored under their
+        new keys and later loads don't re-key them again.
         """
-        records: Dict[str, PatternRecord] = {}
-        with open(self.path, "r", encoding="utf-8", errors="ignore") as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+        return self._read_shared(None)
+
+    def load_subset(self, hashes: Iterable[str]) -> Dict[str, PatternRecord]:
+        """Read only the records whose hash is in *hashes*.
+
+        Same locking and error handling as :meth:`load`, but lines for other
+        patterns are skipped without being JSON-decoded, so the parse cost
+        follows the number of requested hashes rather than the DB size.
+        """
+        return self._read_shared(set(hashes))
+
+    def save(self, records: Dict[str, PatternRecord]) -> None:
+        """Rewrite the DB file with exactly *records*.
+
+        Acquires an exclusive lock (``LOCK_EX``) before truncating, so
+        concurrent writers can't interleave lines. Records are sorted by
+        hash for deterministic output.
+        """
+        with open(self.path, "a", encoding="utf-8") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
             try:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        d = json.loads(line)
-                        rec = PatternRecord.from_dict(d)
-                        records[rec.h] = rec
-                    except (json.JSONDecodeError, KeyError):
-                        continue
+                f.truncate(0)
+                self._write_sorted(f, records)
+                f.flush()
             finally:
                 fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-        return records
+        self._lines = len(records)
+        self._hashes = set(records)
 
-    def save(self, records: Dict[str, PatternRecord]) -> None:
-        """Write all pattern records to the DB file atomically.
+    def append(self, records: Iterable[PatternRecord]) -> None:
+        """Append *records* to the DB, superseding earlier lines for the same hash.
+
+        Only the given records are written, so the cost of a run scales with
+        the number of patterns it touched rather than the size of the DB.
+        Call after :meth:`load` or :meth:`load_subset` so the compaction
+        threshold reflects the records already on disk.
+        """
+        records = list(records)
+        # Encode before taking the lock so it is held only for the write
+        payload = "".join(dumps_compact(rec.to_dict()) + "\n" for rec in records).encode("utf-8")
+        with open(self.path, "ab+") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                # A run that crashed mid-write can leave a partial last line;
+                # end it so the first new record isn't glued onto it
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        payload = b"\n" + payload
+                f.write(payload)
+                f.flush()
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        self._hashes.update(rec.h for rec in records)
+        self._lines += len(records)
+        if self._lines > 2 * len(self._hashes):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the DB with one line per live record, dropping stale lines.
 
-        Acquires an exclusive lock (``LOCK_EX``) to prevent concurrent
-        writes from interleaving lines. Records are sorted by hash for
-        deterministic output.
+        The exclusive lock is held across read and rewrite so appends from
+        concurrent runs are never lost.
         """
-        with open(self.path, "w", encoding="utf-8") as f:
+        with open(self.path, "r+", encoding="utf-8", errors="ignore") as f:
             fcntl.flock(f.fileno(), fcntl.LOCK_EX)
             try:
-                for h in sorted(records.keys()):
-                    f.write(json.dumps(records[h].to_dict(), separators=(",", ":")) + "\n")
+                records = self._read(f)
+                f.seek(0)
+                f.truncate()
+                self._write_sorted(f, records)
+                f.flush()
             finally:
                 fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        self._lines = len(records)
+        self._hashes = set(records)
+        self._legacy = False
 
     def reset(self) -> None:
         """Delete the DB file entirely."""
         if self.path.exists():
             self.path.unlink()
 
+    def _read_shared(self, wanted: Optional[Set[str]]) -> Dict[str, PatternRecord]:
+        """Read records under a shared lock, then compact if any were legacy."""
+        with open(self.path, "r", encoding="utf-8", errors="ignore") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+            try:
+                records = self._read(f, wanted)
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        if self._legacy:
+            self.compact()
+        return records
+
+    def _read(self, f: IO[str], wanted: Optional[Set[str]] = None) -> Dict[str, PatternRecord]:
+        """Parse records from the open file *f*; later lines win.
+
+        If *wanted* is given, only records with those hashes are returned,
+        and lines whose leading hash rules them out are not JSON-decoded.
+        """
+        hashes: Set[str] = set()
+        candidates: List[str] = []
+        lines = 0
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            lines += 1
+            if line.startswith(_KEY_PREFIX) and line[_KEY_END:_KEY_END + 1] == '"':
+                h = line[len(_KEY_PREFIX):_KEY_END]
+                hashes.add(h)
+                if wanted is not None and h not in wanted:
+                    continue
+            candidates.append(line)
+
+        # Decode all remaining lines in one batch; file order is kept so the
+        # last line for a hash still wins
+        records: Dict[str, PatternRecord] = {}
+        legacy: Dict[str, PatternRecord] = {}
+        for d in loads_lines(candidates):
+            try:
+                rec = PatternRecord.from_dict(d)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if len(rec.h) == _LEGACY_HASH_LEN:
+                rec = self._rekey(rec, legacy)
+            hashes.add(rec.h)
+            if wanted is None or rec.h in wanted:
+                records[rec.h] = rec
+        self._lines = lines
+        self._hashes = hashes
+        self._legacy = bool(legacy)
+        return records
+
+    @staticmethod
+    def _rekey(rec: PatternRecord, legacy: Dict[str, PatternRecord]) -> PatternRecord:
+        """Give a legacy SHA-1-keyed record its current pattern and hash.
+
+        The pattern is recomputed from the raw sample line, because the
+        stored one came from an older normalizer (e.g. IDs inside paths
+        used to stay separate placeholders).  Legacy records that now
+        collapse into one pattern are merged via *legacy*, which maps new
+        hashes to the records re-keyed so far.
+        """
+        rec.pattern = normalize_line(rec.sample) or rec.pattern
+        rec.h = pattern_hash(rec.pattern)
+        prev = legacy.get(rec.h)
+        if prev is not None:
+            prev.first_seen = min(prev.first_seen, rec.first_seen)
+            prev.last_seen = max(prev.last_seen, rec.last_seen)
+            prev.total_seen += rec.total_seen
+            return prev
+        legacy[rec.h] = rec
+        return rec
+
+    @staticmethod
+    def _write_sorted(f: IO[str], records: Dict[str, PatternRecord]) -> None:
+        """Write *records* to *f* in hash order, one line each, in one write."""
+        f.write("".join(dumps_compact(records[h].to_dict()) + "\n" for h in sorted(records)))
+
 
 @dataclass
 class BaselineState:
@@ -123,8 +283,15 @@ class BaselineState:
     During baseline learning, new patterns are recorded in the DB but
     no alerts are fired. This lets the tool "learn" normal log patterns
     before it starts flagging anomalies.
+
+    ``last_run`` records, per source description (e.g. ``"docker:myapp"``),
+    when the previous ``--incremental`` run of that source started, so the
+    next one only needs to fetch logs newer than that.  Several sources
+    commonly share one state file, so a single timestamp would make one
+    source skip logs based on another source's run.
     """
     baseline_until: int = 0
+    last_run: Dict[str, int] = field(default_factory=dict)
 
     @staticmethod
     def load(path: Path) -> "BaselineState":
@@ -132,15 +299,21 @@ class BaselineState:
         if not path.exists():
             return BaselineState()
         try:
-            d = json.loads(path.read_text(encoding="utf-8"))
-            return BaselineState(baseline_until=int(d.get("baseline_until", 0)))
+            d = loads(path.read_text(encoding="utf-8"))
+            last_run = d.get("last_run")
+            return BaselineState(
+                baseline_until=int(d.get("baseline_until", 0)),
+                # Older files stored one global timestamp; it cannot be
+                # attributed to a source, so each source starts afresh
+                last_run={str(k): int(v) for k, v in last_run.items()} if isinstance(last_run, dict) else {},
+            )
         except Exception:
             return BaselineState()
 
     def save(self, path: Path) -> None:
         """Persist baseline state to a JSON file."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        path.write_text(dumps_pretty(asdict(self)), encoding="utf-8")
 
     @staticmethod
     def reset(path: Path) -> None:
@@ -160,6 +333,17 @@ class BaselineState:
         st.save(path)
         return until
 
+    @staticmethod
+    def record_run(path: Path, source: str, started: int) -> None:
+        """Remember *started* as the start time of the latest run of *source*."""
+        st = BaselineState.load(path)
+        st.last_run[source] = started
+        st.save(path)
+
+
+_DURATION_RE = re.compile(r"(\d+)\s*([smhd])")
+_DURATION_MULT = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
 
 def parse_duration(s: str) -> int:
     """Parse a human-friendly duration string into seconds.
@@ -169,13 +353,10 @@ def parse_duration(s: str) -> int:
     Raises:
         ValueError: If the string doesn't match ``<number><s|m|h|d>``.
     """
-    m = re.fullmatch(r"(\d+)\s*([smhd])", s.strip().lower())
+    m = _DURATION_RE.fullmatch(s.strip().lower())
     if not m:
         raise ValueError('Invalid duration. Use e.g. "30m", "2h", "1d".')
-    n = int(m.group(1))
-    unit = m.group(2)
-    mult = {"s": 1, "m": 60, "h": 3600, "d": 86400}[unit]
-    return n * mult
+    return int(m.group(1)) * _DURATION_MULT[m.group(2)]
 
 
 def fmt_local_ts(epoch: int) -> str:
@@ -1,49 +1,125 @@
 """Shared pytest fixtures for the Log Whisperer test suite.
 
-Provides reusable temporary directories, file paths, sample data, and
-argument factories so individual test modules stay focused on assertions
-rather than boilerplate setup.
+Provides reusable temporary directories, file paths, read-only sample log
+files, a pre-seeded pattern DB, sample data, and argument factories so
+individual test modules stay focused on assertions rather than
+boilerplate setup.
 """
 
 from __future__ import annotations
 
 import argparse
+import shutil
+import uuid
 from pathlib import Path
 
 import pytest
 
+from log_whisperer.core import WindowPattern, build_report
 
-@pytest.fixture
-def state_dir(tmp_path: Path) -> Path:
-    """Create and return an isolated temporary directory for state files.
+
+@pytest.fixture(scope="session")
+def state_dir(tmp_path_factory) -> Path:
+    """Create one temporary directory for state files, shared by the session.
 
     Used as the parent directory for both the pattern database and the
     baseline state file, ensuring tests never touch the real XDG state
-    directory.
+    directory.  Tests stay isolated through unique file names (see
+    ``db_path`` and ``baseline_path``) rather than a directory each.
     """
-    d = tmp_path / "state"
-    d.mkdir()
-    return d
+    return tmp_path_factory.mktemp("state")
 
 
 @pytest.fixture
 def db_path(state_dir: Path) -> Path:
-    """Return a path inside ``state_dir`` for a temporary patterns.db file.
+    """Return a unique path inside ``state_dir`` for a temporary patterns.db file.
 
     The file does not exist yet — PatternDB.__init__ will create it when
     a test instantiates the database.
     """
-    return state_dir / "patterns.db"
+    return state_dir / f"patterns-{uuid.uuid4().hex}.db"
 
 
 @pytest.fixture
 def baseline_path(state_dir: Path) -> Path:
-    """Return a path inside ``state_dir`` for a temporary baseline.json file.
+    """Return a unique path inside ``state_dir`` for a temporary baseline.json file.
 
     Like ``db_path``, the file is not pre-created so tests can verify
     behaviour on both missing and existing baseline files.
     """
-    return state_dir / "baseline.json"
+    return state_dir / f"baseline-{uuid.uuid4().hex}.json"
+
+
+# Pattern recorded by ``seeded_db``: hash "h1", seen once
+SEED_WINDOW = {
+    "h1": WindowPattern(h="h1", pattern="pat <N>", count=1, severity="INFO", sample="pat 1"),
+}
+
+
+@pytest.fixture(scope="module")
+def seeded_db_template(tmp_path_factory) -> Path:
+    """Build a pattern DB containing ``SEED_WINDOW`` once per test module.
+
+    Tests should not modify this file; use ``seeded_db`` for a private copy.
+    """
+    d = tmp_path_factory.mktemp("seed")
+    db = d / "patterns.db"
+    build_report(
+        src_desc="seed",
+        since="1h",
+        lines_limit=100,
+        db_path=db,
+        baseline_path=d / "baseline.json",
+        window=SEED_WINDOW,
+        show_new_only=False,
+        min_severity="INFO",
+    )
+    return db
+
+
+@pytest.fixture
+def seeded_db(db_path: Path, seeded_db_template: Path) -> Path:
+    """Return ``db_path`` pre-populated with the ``SEED_WINDOW`` pattern.
+
+    The DB is copied from a per-module template rather than rebuilt by
+    running ``build_report`` in every test that needs a "seen" pattern.
+    """
+    shutil.copyfile(seeded_db_template, db_path)
+    return db_path
+
+
+@pytest.fixture(scope="session")
+def log_dir(tmp_path_factory) -> Path:
+    """Session-wide directory holding the read-only sample log files below."""
+    return tmp_path_factory.mktemp("logs")
+
+
+@pytest.fixture(scope="session")
+def log20(log_dir: Path) -> Path:
+    """A 20-line log file (``line0`` .. ``line19``, no trailing newline).
+
+    Like the other ``log_*`` fixtures it is written once per session and
+    must not be modified by tests.
+    """
+    p = log_dir / "20.log"
+    p.write_text("\n".join(f"line{i}" for i in range(20)))
+    return p
+
+
+@pytest.fixture(scope="session")
+def log_small(log_dir: Path) -> Path:
+    """A three-line log file (``one``, ``two``, ``three``)."""
+    p = log_dir / "small.log"
+    p.write_text("one\ntwo\nthree")
+    return p
+
+
+@pytest.fixture(scope="session")
+def log_empty(log_dir: Path) -> Path:
+    """An empty log file."""
+    p = log_dir / "empty.log"
+    p.write_text("")
+    return p
 
 
 @pytest.fixture
@@ -105,6 +181,7 @@ def make_args():
             # Analysis parameters
             since="1h",
             lines=5000,
+            incremental=False,
             show_new=False,
             min_severity="INFO",
             show_samples=False,
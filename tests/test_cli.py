@@ -6,11 +6,12 @@ tests exercise the full ``main()`` pipeline against temporary log files
 and state directories, verifying text/JSON output and state side-effects.
 """
 
-import json
+import io
 
 import pytest
 
-from log_whisperer.cli import parse_args, main
+from log_whisperer._json import loads
+from log_whisperer.cli import _build_parser, parse_args, main
 
 
 # ---------------------------------------------------------------------------
@@ -54,21 +55,38 @@ class TestParseArgs:
         args = parse_args(["--file", "x.log", "--lines", "200"])
         assert args.lines == 200
 
-    def test_min_severity_restricted(self):
-        """``--min-severity`` only accepts INFO, WARN, or ERROR.  Any other
-        value (e.g. DEBUG) should trigger an argparse error."""
-        for sev in ("INFO", "WARN", "ERROR"):
-            args = parse_args(["--file", "x.log", "--min-severity", sev])
-            assert args.min_severity == sev
-        # An unsupported severity level should be rejected
+    @pytest.mark.parametrize("sev", ["INFO", "WARN", "ERROR"])
+    def test_min_severity_accepted(self, sev):
+        """``--min-severity`` accepts INFO, WARN, or ERROR."""
+        args = parse_args(["--file", "x.log", "--min-severity", sev])
+        assert args.min_severity == sev
+
+    @pytest.mark.parametrize("sev", ["DEBUG", "TRACE", "FATAL", "info"])
+    def test_min_severity_rejected(self, sev):
+        """Any other ``--min-severity`` value, including a lowercase level,
+        should trigger an argparse error."""
         with pytest.raises(SystemExit):
-            parse_args(["--file", "x.log", "--min-severity", "DEBUG"])
+            parse_args(["--file", "x.log", "--min-severity", sev])
 
     def test_since_default(self):
         """The default value for ``--since`` should be ``'1h'`` (one hour)."""
         args = parse_args(["--file", "x.log"])
         assert args.since == "1h"
 
+    def test_parser_built_once(self):
+        """The argument parser should be constructed once and reused."""
+        assert _build_parser() is _build_parser()
+
+    def test_env_defaults_read_per_call(self, monkeypatch):
+        """Environment-based defaults should reflect the environment at
+        parse time even though the parser itself is cached."""
+        parse_args(["--file", "x.log"])
+        monkeypatch.setenv("LOGWHISPERER_NTFY_TOPIC", "from-env")
+        monkeypatch.setenv("LOGWHISPERER_SMTP_PORT", "2525")
+        args = parse_args(["--file", "x.log"])
+        assert args.notify_ntfy_topic == "from-env"
+        assert args.notify_email_port == 2525
+
 
 # ---------------------------------------------------------------------------
 # main integration
@@ -76,68 +94,117 @@ class TestParseArgs:
 class TestMain:
     """End-to-end integration tests that invoke ``main()`` with temp files."""
 
-    def test_run_with_file(self, tmp_path, capsys):
+    @pytest.fixture
+    def state_argv(self, db_path, baseline_path):
+        """``--state-db`` / ``--baseline-state`` arguments pointing at the
+        isolated temp state files from ``conftest``."""
+        return ["--state-db", str(db_path), "--baseline-state", str(baseline_path)]
+
+    def test_run_with_file(self, tmp_path, db_path, state_argv):
         """Running the full pipeline on a real temp log file should produce
-        a text report on stdout and create a pattern DB file on disk."""
+        a text report on the output stream and create a pattern DB file on disk."""
         log = tmp_path / "app.log"
         log.write_text("error happened\nnormal line\nerror happened\n")
-        db = tmp_path / "test.db"
-        bl = tmp_path / "baseline.json"
 
-        main(["--file", str(log), "--state-db", str(db), "--baseline-state", str(bl)])
+        out = io.StringIO()
+        main(["--file", str(log), *state_argv], out=out)
 
-        out = capsys.readouterr().out
         # The text report header should be present
-        assert "Log Whisperer Report" in out
+        assert "Log Whisperer Report" in out.getvalue()
         # The DB file should have been created by build_report
-        assert db.exists()
+        assert db_path.exists()
 
-    def test_reset_removes_db(self, tmp_path, capsys):
+    def test_reset_removes_db(self, tmp_path, db_path, baseline_path, state_argv):
         """``--reset`` should delete both the pattern DB and baseline files
         and print a confirmation message."""
-        db = tmp_path / "test.db"
-        bl = tmp_path / "baseline.json"
         # Pre-create the files so reset has something to delete
-        db.write_text("")
-        bl.write_text("{}")
+        db_path.write_text("")
+        baseline_path.write_text("{}")
 
-        main(["--reset", "--file", str(tmp_path / "x.log"),
-              "--state-db", str(db), "--baseline-state", str(bl)])
+        out = io.StringIO()
+        main(["--reset", "--file", str(tmp_path / "x.log"), *state_argv], out=out)
 
-        out = capsys.readouterr().out
-        assert "Reset" in out
+        assert "Reset" in out.getvalue()
         # Both state files should be gone
-        assert not db.exists()
+        assert not db_path.exists()
+        assert not baseline_path.exists()
 
-    def test_json_output(self, tmp_path, capsys):
+    def test_json_output(self, tmp_path, state_argv):
         """``--json`` should cause ``main()`` to emit a valid JSON report
         instead of the human-readable text format."""
         log = tmp_path / "app.log"
         log.write_text("something happened\n")
-        db = tmp_path / "test.db"
-        bl = tmp_path / "baseline.json"
 
-        main(["--file", str(log), "--json",
-              "--state-db", str(db), "--baseline-state", str(bl)])
+        out = io.StringIO()
+        main(["--file", str(log), "--json", *state_argv], out=out)
 
-        out = capsys.readouterr().out
-        # The output should be parseable JSON with the expected top-level keys
-        parsed = json.loads(out)
+        # The output should be parseable JSON with the expected top-level keys;
+        # _json.loads uses orjson when the "fast" extra is installed
+        parsed = loads(out.getvalue())
         assert "items" in parsed
         assert "source" in parsed
 
-    def test_baseline_learn(self, tmp_path, capsys):
+    def test_baseline_learn(self, tmp_path, baseline_path, state_argv):
         """``--baseline-learn 1h`` should activate baseline learning, write
         the baseline state file, and print a confirmation message."""
         log = tmp_path / "app.log"
         log.write_text("test line\n")
-        db = tmp_path / "test.db"
-        bl = tmp_path / "baseline.json"
 
-        main(["--file", str(log), "--baseline-learn", "1h",
-              "--state-db", str(db), "--baseline-state", str(bl)])
+        out = io.StringIO()
+        main(["--file", str(log), "--baseline-learn", "1h", *state_argv], out=out)
 
-        out = capsys.readouterr().out
-        assert "Baseline learning enabled" in out
+        assert "Baseline learning enabled" in out.getvalue()
         # The baseline state file should have been persisted
-        assert bl.exists()
+        assert baseline_path.exists()
+
+    def test_incremental_fetches_since_last_run(self, state_argv, monkeypatch):
+        """With ``--incremental``, the first run should use ``--since`` and
+        record its start time; the next run should fetch from that time."""
+        import log_whisperer.cli as cli_mod
+        calls = []
+
+        def fake_read_lines(args, since_epoch=None):
+            calls.append(since_epoch)
+            return ["some line"], "docker:c"
+
+        monkeypatch.setattr(cli_mod, "read_lines", fake_read_lines)
+        argv = ["--docker", "c", "--incremental", *state_argv]
+        main(argv, out=io.StringIO())
+        main(argv, out=io.StringIO())
+        assert calls[0] is None
+        assert calls[1] is not None
+
+    def test_incremental_tracks_each_source_separately(self, state_argv, monkeypatch):
+        """Two sources sharing one state file must not share ``last_run``:
+        the first ``--incremental`` run of source b should use ``--since``
+        even after source a has run, and a's next run should still
+        resume from a's own start time."""
+        import log_whisperer.cli as cli_mod
+        calls = []
+
+        def fake_read_lines(args, since_epoch=None):
+            calls.append((args.docker, since_epoch))
+            return ["some line"], f"docker:{args.docker}"
+
+        clock = iter([1_700_000_000, 1_700_000_100, 1_700_000_200])
+        monkeypatch.setattr(cli_mod, "read_lines", fake_read_lines)
+        monkeypatch.setattr(cli_mod, "now_epoch", lambda: next(clock))
+        for container in ("a", "b", "a"):
+            main(["--docker", container, "--incremental", *state_argv], out=io.StringIO())
+        assert calls == [("a", None), ("b", None), ("a", 1_700_000_000)]
+
+    def test_lazy_source_error_exits_cleanly(self, state_argv, monkeypatch, capsys):
+        """An error raised while a lazy source is being iterated should be
+        reported like any other source error: ``Error: ...`` on stderr
+        and exit status 2."""
+        import log_whisperer.cli as cli_mod
+
+        def failing_lines():
+            yield "first line"
+            raise RuntimeError("Command failed (1): docker logs")
+
+        monkeypatch.setattr(cli_mod, "read_lines", lambda args, since_epoch=None: (failing_lines(), "docker:c"))
+        with pytest.raises(SystemExit) as exc:
+            main(["--docker", "c", *state_argv])
+        assert exc.value.code == 2
+        assert "Error: Command failed" in capsys.readouterr().err
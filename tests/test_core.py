@@ -6,6 +6,8 @@ produce NEW/seen tags, and formatted into alert messages for notification
 dispatch.
 """
 
+import time
+
 from log_whisperer.core import (
     WindowPattern,
     build_report,
@@ -36,7 +38,7 @@ class TestCluster:
         ``count`` reflects how many times the line appeared."""
         window = cluster(["hello world", "hello world", "hello world"])
         assert len(window) == 1
-        wp = list(window.values())[0]
+        wp = next(iter(window.values()))
         assert wp.count == 3
 
     def test_different_lines_separate_patterns(self):
@@ -49,21 +51,76 @@ class TestCluster:
         """The ``sample`` field should preserve the first raw occurrence of
         a pattern, not the last, so users see the original log line."""
         window = cluster(["test line 1", "test line 1"])
-        wp = list(window.values())[0]
+        wp = next(iter(window.values()))
         assert wp.sample == "test line 1"
 
+    def test_repeated_raw_lines_normalized_once(self, monkeypatch):
+        """Identical raw lines should only be normalized once per call,
+        while still being counted individually."""
+        import log_whisperer.core as core_mod
+        calls = []
+        real = core_mod.normalize_line
+        monkeypatch.setattr(core_mod, "normalize_line", lambda raw: calls.append(raw) or real(raw))
+        window = cluster(["same line", "same line", "", "", "other line"])
+        assert calls == ["same line", "", "other line"]
+        assert sorted(wp.count for wp in window.values()) == [1, 2]
+
+    def test_raw_cache_dropped_for_distinct_lines(self, monkeypatch):
+        """If too few of the first lines repeat (timestamped logs), the raw
+        line cache should be abandoned: later repeats are normalized again
+        instead of every distinct line being held in memory."""
+        import log_whisperer.core as core_mod
+        monkeypatch.setattr(core_mod, "_RAW_CACHE_PROBE", 4)
+        monkeypatch.setattr(core_mod, "_RAW_CACHE_MIN_HITS", 1)
+        calls = []
+        real = core_mod.normalize_line
+        monkeypatch.setattr(core_mod, "normalize_line", lambda raw: calls.append(raw) or real(raw))
+        window = cluster(["a 1", "b 2", "c 3", "d 4", "x", "x"])
+        assert calls == ["a 1", "b 2", "c 3", "d 4", "x", "x"]
+        assert sorted(wp.count for wp in window.values()) == [1, 1, 1, 1, 2]
+
+    def test_raw_cache_size_bounded(self, monkeypatch):
+        """Once the cache is full, new raw lines should be normalized on
+        every occurrence rather than added, while counts stay exact."""
+        import log_whisperer.core as core_mod
+        monkeypatch.setattr(core_mod, "_RAW_CACHE_PROBE", 2)
+        monkeypatch.setattr(core_mod, "_RAW_CACHE_MIN_HITS", 1)
+        monkeypatch.setattr(core_mod, "_RAW_CACHE_MAX", 1)
+        calls = []
+        real = core_mod.normalize_line
+        monkeypatch.setattr(core_mod, "normalize_line", lambda raw: calls.append(raw) or real(raw))
+        window = cluster(["a", "a", "a", "b", "b"])
+        assert calls == ["a", "b", "b"]
+        assert sorted(wp.count for wp in window.values()) == [2, 3]
+
+    def test_severity_classified_once_per_pattern(self, monkeypatch):
+        """``severity_of`` should run once per unique pattern, not once per
+        line, even when different raw lines share a pattern."""
+        import log_whisperer.core as core_mod
+        calls = []
+        real = core_mod.severity_of
+        monkeypatch.setattr(core_mod, "severity_of", lambda pat: calls.append(pat) or real(pat))
+        cluster(["retry 1", "retry 2", "retry 3", "error 4"])
+        assert calls == ["retry <N>", "error <N>"]
+
 
 # ---------------------------------------------------------------------------
 # build_report
 # ---------------------------------------------------------------------------
+# Window entries shared by the build_report tests.  build_report only reads
+# them, so one instance per variant is enough.
+_H1_COUNT1 = WindowPattern(h="h1", pattern="pat <N>", count=1, severity="INFO", sample="pat 1")
+_H1_COUNT2 = WindowPattern(h="h1", pattern="pat <N>", count=2, severity="INFO", sample="pat 1")
+_H1_COUNT3 = WindowPattern(h="h1", pattern="pat <N>", count=3, severity="INFO", sample="pat 1")
+_H1_ERROR = WindowPattern(h="h1", pattern="pat <N>", count=1, severity="ERROR", sample="pat 1")
+
+
 class TestBuildReport:
     """Verify report generation, DB diffing, tagging, and filtering logic."""
 
     def test_new_patterns_tagged_new(self, db_path, baseline_path):
         """A pattern not yet in the DB should appear in the report with tag ``'NEW'``."""
-        window = {
-            "h1": WindowPattern(h="h1", pattern="pat <N>", count=2, severity="INFO", sample="pat 1"),
-        }
+        window = {"h1": _H1_COUNT2}
         report, alerted, _ = build_report(
             src_desc="test",
             since="1h",
@@ -77,29 +134,16 @@ class TestBuildReport:
         assert len(report.items) == 1
         assert report.items[0].tag == "NEW"
 
-    def test_seen_patterns_tagged_seen(self, db_path, baseline_path):
+    def test_seen_patterns_tagged_seen(self, seeded_db, baseline_path):
         """A pattern already present in the DB (from a prior run) should be
         tagged ``'seen'`` on subsequent runs."""
-        window = {
-            "h1": WindowPattern(h="h1", pattern="pat <N>", count=2, severity="INFO", sample="pat 1"),
-        }
-        # First run seeds the DB with h1
-        build_report(
-            src_desc="test",
-            since="1h",
-            lines_limit=100,
-            db_path=db_path,
-            baseline_path=baseline_path,
-            window=window,
-            show_new_only=False,
-            min_severity="INFO",
-        )
-        # Second run should recognise h1 as already known
+        window = {"h1": _H1_COUNT2}
+        # The seeded DB already knows h1
         report, _, _ = build_report(
             src_desc="test",
             since="1h",
             lines_limit=100,
-            db_path=db_path,
+            db_path=seeded_db,
             baseline_path=baseline_path,
             window=window,
             show_new_only=False,
@@ -110,9 +154,7 @@ class TestBuildReport:
     def test_db_updated_after_build(self, db_path, baseline_path):
         """After ``build_report`` completes, the pattern DB on disk should
         contain the window's patterns with correct cumulative counts."""
-        window = {
-            "h1": WindowPattern(h="h1", pattern="pat <N>", count=3, severity="INFO", sample="pat 1"),
-        }
+        window = {"h1": _H1_COUNT3}
         build_report(
             src_desc="test",
             since="1h",
@@ -128,29 +170,16 @@ class TestBuildReport:
         assert "h1" in records
         assert records["h1"].total_seen == 3
 
-    def test_show_new_only_filters_seen(self, db_path, baseline_path):
+    def test_show_new_only_filters_seen(self, seeded_db, baseline_path):
         """With ``show_new_only=True``, previously-seen patterns should be
         excluded from the report items but still have their DB counts updated."""
-        window = {
-            "h1": WindowPattern(h="h1", pattern="pat <N>", count=1, severity="INFO", sample="pat 1"),
-        }
-        # First run: h1 is NEW and gets recorded
-        build_report(
-            src_desc="test",
-            since="1h",
-            lines_limit=100,
-            db_path=db_path,
-            baseline_path=baseline_path,
-            window=window,
-            show_new_only=False,
-            min_severity="INFO",
-        )
-        # Second run with show_new_only: h1 is now "seen" and should be filtered out
+        window = {"h1": _H1_COUNT1}
+        # h1 is already in the seeded DB, so it is "seen" and filtered out
         report, _, _ = build_report(
             src_desc="test",
             since="1h",
             lines_limit=100,
-            db_path=db_path,
+            db_path=seeded_db,
             baseline_path=baseline_path,
             window=window,
             show_new_only=True,
@@ -158,7 +187,7 @@ class TestBuildReport:
         )
         assert len(report.items) == 0
         # The DB total should still accumulate (1 + 1 = 2)
-        records = PatternDB(db_path).load()
+        records = PatternDB(seeded_db).load()
         assert records["h1"].total_seen == 2
 
     def test_min_severity_filters(self, db_path, baseline_path):
@@ -185,14 +214,13 @@ class TestBuildReport:
         records = PatternDB(db_path).load()
         assert "h1" in records
 
-    def test_baseline_active_suppresses_alerts(self, db_path, baseline_path):
+    def test_baseline_active_suppresses_alerts(self, db_path, baseline_path, monkeypatch):
         """When baseline learning is active, ``alerted_items`` should be empty
         even for NEW patterns, because no alerts should fire during learning."""
-        # Activate baseline learning for 1 hour
-        BaselineState.enable_learning(baseline_path, 3600)
-        window = {
-            "h1": WindowPattern(h="h1", pattern="pat <N>", count=1, severity="ERROR", sample="pat 1"),
-        }
+        # Baseline learning active for another hour, without touching disk
+        active = BaselineState(baseline_until=int(time.time()) + 3600)
+        monkeypatch.setattr(BaselineState, "load", staticmethod(lambda path: active))
+        window = {"h1": _H1_ERROR}
         _, alerted, baseline_active = build_report(
             src_desc="test",
             since="1h",
@@ -227,6 +255,25 @@ class TestBuildReport:
         counts = [it.count_window for it in report.items]
         assert counts == [10, 5, 1]
 
+    def test_alerted_items_sorted_by_count_desc(self, db_path, baseline_path):
+        """Alerted items should follow the report's count ordering, so alert
+        messages truncated to the first few items show the noisiest ones."""
+        window = {
+            "h1": WindowPattern(h="h1", pattern="low", count=1, severity="ERROR", sample="low"),
+            "h2": WindowPattern(h="h2", pattern="high", count=10, severity="ERROR", sample="high"),
+        }
+        _, alerted, _ = build_report(
+            src_desc="test",
+            since="1h",
+            lines_limit=100,
+            db_path=db_path,
+            baseline_path=baseline_path,
+            window=window,
+            show_new_only=False,
+            min_severity="INFO",
+        )
+        assert [it.count_window for it in alerted] == [10, 1]
+
 
 # ---------------------------------------------------------------------------
 # format_alert_message
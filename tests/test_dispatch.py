@@ -3,15 +3,34 @@
 Validates that ``dispatch_notifications`` correctly routes alert messages
 to configured channels (ntfy, Telegram, email), skips unconfigured ones,
 collects per-channel failures independently, and returns an empty list on
-full success.  All external network calls are mocked to keep tests fast
-and isolated.
+full success.  An autouse fixture swaps the three senders for ``MagicMock``
+objects, so no test touches the network.
 """
 
-from unittest.mock import patch
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+import pytest
+
+from log_whisperer.notify import dispatch
 from log_whisperer.notify.dispatch import dispatch_notifications
 
 
+@pytest.fixture(autouse=True)
+def mock_notifiers(monkeypatch):
+    """Replace the three senders with ``MagicMock`` objects for every test.
+
+    The mocks succeed by default; tests make a channel fail by setting its
+    ``side_effect``.
+    """
+    ntfy, telegram, email = MagicMock(), MagicMock(), MagicMock()
+    monkeypatch.setattr(dispatch, "notify_ntfy", ntfy)
+    monkeypatch.setattr(dispatch, "notify_telegram", telegram)
+    monkeypatch.setattr(dispatch, "notify_email_smtp", email)
+    return SimpleNamespace(ntfy=ntfy, telegram=telegram, email=email)
+
+
 class TestDispatchNotifications:
     """Verify notification channel routing, error collection, and skip logic."""
 
@@ -22,24 +41,24 @@ class TestDispatchNotifications:
         failures = dispatch_notifications(args, "test alert")
         assert failures == []
 
-    def test_ntfy_failure_appended(self, make_args):
+    def test_ntfy_failure_appended(self, make_args, mock_notifiers):
         """When the ntfy channel is configured but the send fails, the error
         should be captured in the failures list with an ``'ntfy'`` prefix."""
         args = make_args(notify_ntfy_topic="test-topic")
-        # Mock notify_ntfy to simulate a network error
-        with patch("log_whisperer.notify.dispatch.notify_ntfy", side_effect=Exception("connection error")):
-            failures = dispatch_notifications(args, "test alert")
+        mock_notifiers.ntfy.side_effect = Exception("connection error")
+        failures = dispatch_notifications(args, "test alert")
         assert len(failures) == 1
         assert "ntfy" in failures[0]
 
-    def test_telegram_skipped_if_chat_id_missing(self, make_args):
+    def test_telegram_skipped_if_chat_id_missing(self, make_args, mock_notifiers):
         """Telegram requires both a bot token *and* a chat ID.  If the chat ID
         is missing, the channel should be silently skipped (no failure)."""
         args = make_args(notify_telegram_token="tok123", notify_telegram_chat_id="")
         failures = dispatch_notifications(args, "test alert")
         assert failures == []
+        mock_notifiers.telegram.assert_not_called()
 
-    def test_email_skipped_if_host_missing(self, make_args):
+    def test_email_skipped_if_host_missing(self, make_args, mock_notifiers):
         """Email requires a host, sender, and recipient.  If the SMTP host is
         missing, the channel should be silently skipped even when sender and
         recipient are provided."""
@@ -50,8 +69,9 @@ class TestDispatchNotifications:
         )
         failures = dispatch_notifications(args, "test alert")
         assert failures == []
+        mock_notifiers.email.assert_not_called()
 
-    def test_all_channels_fail_independently(self, make_args):
+    def test_all_channels_fail_independently(self, make_args, mock_notifiers):
         """When all three channels are configured and all three raise, each
         failure should be captured independently — one broken channel must
         not prevent the others from being attempted."""
@@ -63,17 +83,14 @@ class TestDispatchNotifications:
             notify_email_from="a@b.com",
             notify_email_to="c@d.com",
         )
-        # Mock all three senders to raise
-        with (
-            patch("log_whisperer.notify.dispatch.notify_ntfy", side_effect=Exception("ntfy fail")),
-            patch("log_whisperer.notify.dispatch.notify_telegram", side_effect=Exception("tg fail")),
-            patch("log_whisperer.notify.dispatch.notify_email_smtp", side_effect=Exception("email fail")),
-        ):
-            failures = dispatch_notifications(args, "test alert")
+        mock_notifiers.ntfy.side_effect = Exception("ntfy fail")
+        mock_notifiers.telegram.side_effect = Exception("tg fail")
+        mock_notifiers.email.side_effect = Exception("email fail")
+        failures = dispatch_notifications(args, "test alert")
         # All three channels should have reported a failure
         assert len(failures) == 3
 
-    def test_successful_dispatch_returns_empty(self, make_args):
+    def test_successful_dispatch_returns_empty(self, make_args, mock_notifiers):
         """When all three channels are configured and all succeed, the
         failures list should be empty."""
         args = make_args(
@@ -84,11 +101,32 @@ class TestDispatchNotifications:
             notify_email_from="a@b.com",
             notify_email_to="c@d.com",
         )
-        # Mock all three senders to succeed (default mock returns None)
-        with (
-            patch("log_whisperer.notify.dispatch.notify_ntfy"),
-            patch("log_whisperer.notify.dispatch.notify_telegram"),
-            patch("log_whisperer.notify.dispatch.notify_email_smtp"),
-        ):
-            failures = dispatch_notifications(args, "test alert")
+        failures = dispatch_notifications(args, "test alert")
+        assert failures == []
+        mock_notifiers.ntfy.assert_called_once()
+        mock_notifiers.telegram.assert_called_once()
+        mock_notifiers.email.assert_called_once()
+
+    def test_channels_sent_concurrently(self, make_args, mock_notifiers):
+        """All configured channels should be in flight at the same time.
+        Each mocked sender waits on a shared barrier, which can only be
+        passed if the three sends run concurrently rather than one after
+        another."""
+        args = make_args(
+            notify_ntfy_topic="topic",
+            notify_telegram_token="tok",
+            notify_telegram_chat_id="123",
+            notify_email_host="smtp.example.com",
+            notify_email_from="a@b.com",
+            notify_email_to="c@d.com",
+        )
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait(*args, **kwargs):
+            barrier.wait()
+
+        mock_notifiers.ntfy.side_effect = wait
+        mock_notifiers.telegram.side_effect = wait
+        mock_notifiers.email.side_effect = wait
+        failures = dispatch_notifications(args, "test alert")
         assert failures == []
@@ -0,0 +1,127 @@
+"""Tests for log_whisperer.notify.email_smtp — SMTP sender and connection pool.
+
+Validates that ``notify_email_smtp`` reuses pooled connections between
+sends, replaces idle or stale connections, retries once when the server
+drops a pooled connection, and that ``close_all`` shuts everything down.
+A fake ``smtplib.SMTP`` class stands in for the network.
+"""
+
+import smtplib
+
+import pytest
+
+from log_whisperer.notify import email_smtp
+from log_whisperer.notify.email_smtp import _SmtpPool, notify_email_smtp
+
+
+class FakeSMTP:
+    """Minimal stand-in for ``smtplib.SMTP`` that records its usage."""
+
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.host = host
+        self.port = port
+        self.sent = []
+        self.closed = False
+        self.alive = True
+        self.fail_next_send = None
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def noop(self):
+        return (250, b"OK") if self.alive else (421, b"closing")
+
+    def send_message(self, msg):
+        if self.fail_next_send is not None:
+            exc, self.fail_next_send = self.fail_next_send, None
+            raise exc
+        self.sent.append(msg)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    """Replace ``smtplib.SMTP`` with ``FakeSMTP`` and install a fresh pool."""
+    FakeSMTP.instances = []
+    monkeypatch.setattr(email_smtp.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_smtp, "_pool", _SmtpPool())
+    return FakeSMTP
+
+
+def _send(body="alert"):
+    """Helper: send one email with fixed connection settings."""
+    notify_email_smtp(
+        host="smtp.example.com",
+        port=587,
+        username="user",
+        password="pass",
+        sender="a@b.com",
+        recipient="c@d.com",
+        subject="subject",
+        body=body,
+    )
+
+
+class TestSmtpPool:
+    """Verify connection reuse, expiry, and reconnect behaviour."""
+
+    def test_connection_reused_between_sends(self, fake_smtp):
+        """Two back-to-back sends should share a single SMTP connection."""
+        _send("one")
+        _send("two")
+        assert len(fake_smtp.instances) == 1
+        assert len(fake_smtp.instances[0].sent) == 2
+
+    def test_idle_connection_replaced(self, fake_smtp):
+        """A pooled connection idle for longer than ``idle_timeout`` should
+        be closed and replaced by a new one."""
+        email_smtp._pool.idle_timeout = -1
+        _send("one")
+        _send("two")
+        assert len(fake_smtp.instances) == 2
+        assert fake_smtp.instances[0].closed
+
+    def test_dead_connection_replaced(self, fake_smtp):
+        """A pooled connection that fails the ``NOOP`` probe should be
+        replaced transparently."""
+        _send("one")
+        fake_smtp.instances[0].alive = False
+        _send("two")
+        assert len(fake_smtp.instances) == 2
+        assert len(fake_smtp.instances[1].sent) == 1
+
+    def test_server_disconnect_retried_once(self, fake_smtp):
+        """If the server drops a pooled connection mid-send, the message
+        should be re-sent once on a fresh connection."""
+        _send("one")
+        fake_smtp.instances[0].fail_next_send = smtplib.SMTPServerDisconnected("gone")
+        _send("two")
+        assert len(fake_smtp.instances) == 2
+        assert len(fake_smtp.instances[1].sent) == 1
+
+    def test_other_errors_raised(self, fake_smtp):
+        """Errors other than a dropped connection should propagate without
+        a retry, and the broken connection should not be pooled."""
+        _send("one")
+        fake_smtp.instances[0].fail_next_send = smtplib.SMTPDataError(554, b"rejected")
+        with pytest.raises(smtplib.SMTPDataError):
+            _send("two")
+        assert len(fake_smtp.instances) == 1
+        assert fake_smtp.instances[0].closed
+
+    def test_close_all_closes_pooled_connections(self, fake_smtp):
+        """``close_all`` should quit every pooled connection."""
+        _send()
+        email_smtp._pool.close_all()
+        assert fake_smtp.instances[0].closed
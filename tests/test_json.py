@@ -0,0 +1,73 @@
+"""Tests for log_whisperer._json — JSON helpers with optional orjson.
+
+Validates that the stdlib fallback and the orjson fast path (when
+installed) encode the same data to identical text, that decode
+errors are still catchable as ``json.JSONDecodeError``, and that
+``loads_lines`` tolerates malformed lines.
+"""
+
+import importlib
+import json
+import sys
+
+import pytest
+
+from log_whisperer import _json
+
+SAMPLE = {"h": "abc", "total_seen": 3, "active": True, "items": [{"tag": "NEW"}], "empty": []}
+
+
+@pytest.fixture
+def stdlib_json(monkeypatch):
+    """Reload ``_json`` with orjson hidden so the stdlib fallback is used."""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    yield importlib.reload(_json)
+    monkeypatch.undo()
+    importlib.reload(_json)
+
+
+class TestJsonHelpers:
+    """Verify encoding format and backend equivalence."""
+
+    def test_compact_has_no_whitespace(self):
+        """``dumps_compact`` should produce single-line output without
+        spaces after separators, matching the DB line format."""
+        assert _json.dumps_compact({"a": 1, "b": [1, 2]}) == '{"a":1,"b":[1,2]}'
+
+    def test_pretty_matches_stdlib_indent(self):
+        """``dumps_pretty`` should match ``json.dumps(indent=2)`` for ASCII data."""
+        assert _json.dumps_pretty(SAMPLE) == json.dumps(SAMPLE, indent=2)
+
+    def test_stdlib_fallback(self, stdlib_json):
+        """Without orjson, the helpers should fall back to the stdlib."""
+        assert stdlib_json.orjson is None
+        assert stdlib_json.dumps_pretty(SAMPLE) == json.dumps(SAMPLE, indent=2)
+        assert stdlib_json.loads(stdlib_json.dumps_compact(SAMPLE)) == SAMPLE
+
+    def test_decode_error_is_json_decode_error(self):
+        """Malformed input should raise ``json.JSONDecodeError`` with
+        either backend, so callers can catch a single exception type."""
+        with pytest.raises(json.JSONDecodeError):
+            _json.loads("NOT VALID JSON")
+
+    @pytest.mark.parametrize("backend", ["default", "stdlib"])
+    def test_loads_lines_maps_bad_lines_to_none(self, backend, request):
+        """``loads_lines`` should decode each line in order and return
+        ``None`` for malformed ones, with either backend."""
+        mod = request.getfixturevalue("stdlib_json") if backend == "stdlib" else _json
+        lines = ['{"a":1}', "NOT VALID JSON", '{"b":2}']
+        assert mod.loads_lines(lines) == [{"a": 1}, None, {"b": 2}]
+        assert mod.loads_lines(['{"a":1}', "[2]"]) == [{"a": 1}, [2]]
+        assert mod.loads_lines([]) == []
+
+    @pytest.mark.parametrize("backend", ["default", "stdlib"])
+    def test_lone_surrogates_round_trip(self, backend, request):
+        """Strings with lone surrogates (a non-UTF-8 file name decoded with
+        ``surrogateescape``) should encode as the stdlib does and decode
+        back unchanged, with either backend."""
+        mod = request.getfixturevalue("stdlib_json") if backend == "stdlib" else _json
+        obj = {"source": "file:/var/log/caf\udce9.log"}
+        assert mod.dumps_compact(obj) == json.dumps(obj, separators=(",", ":"))
+        assert mod.dumps_pretty(obj) == json.dumps(obj, indent=2)
+        assert mod.loads(mod.dumps_compact(obj)) == obj
+        assert mod.loads_lines([mod.dumps_compact(obj)]) == [obj]
@@ -1,13 +1,25 @@
 """Tests for log_whisperer.report — text and JSON output formatters.
 
-Validates that ``report_to_json`` produces valid, complete JSON and that
+Validates that ``report_to_json`` produces valid, complete JSON, that the
+streaming ``write_report_json`` matches it exactly, and that
 ``print_text_report`` outputs the expected human-readable sections
-(header, items, tips, baseline status) to stdout.
+(header, items, tips, baseline status) to its output stream.
 """
 
+import io
 import json
+from dataclasses import FrozenInstanceError, asdict
 
-from log_whisperer.report import Report, ReportItem, print_text_report, report_to_json
+import pytest
+
+from log_whisperer.report import (
+    Report,
+    ReportItem,
+    iter_report_json,
+    print_text_report,
+    report_to_json,
+    write_report_json,
+)
 
 
 def _make_report(items=None, baseline_active=False, baseline_until=0):
@@ -37,75 +49,124 @@ def _make_item(tag="NEW", pattern="test pattern", severity="ERROR", count=3):
     )
 
 
+@pytest.fixture(scope="module")
+def report():
+    """One-item report shared by every test in the module (``Report`` is frozen)."""
+    return _make_report(items=[_make_item()])
+
+
+@pytest.fixture(scope="module")
+def parsed_report(report):
+    """``report`` encoded with ``report_to_json`` and parsed back, once per
+    module.  The dict is shared, so tests must only read it."""
+    return json.loads(report_to_json(report))
+
+
 class TestReportToJson:
     """Verify JSON serialization of the full report."""
 
-    def test_returns_valid_json(self):
+    def test_returns_valid_json(self, parsed_report):
         """``report_to_json`` should return a string that parses as valid JSON
         and contains the expected top-level fields."""
-        report = _make_report(items=[_make_item()])
-        result = report_to_json(report)
-        parsed = json.loads(result)
-        assert parsed["source"] == "test:src"
-        assert len(parsed["items"]) == 1
+        assert parsed_report["source"] == "test:src"
+        assert len(parsed_report["items"]) == 1
 
-    def test_all_fields_present(self):
+    def test_all_fields_present(self, parsed_report):
         """Every Report and ReportItem field should be present in the JSON
         output so downstream consumers can rely on a stable schema."""
-        report = _make_report(items=[_make_item()])
-        parsed = json.loads(report_to_json(report))
         # Top-level report fields
         for field in ("source", "since", "lines_limit", "state_db",
                       "baseline_active", "baseline_until", "generated_at", "items"):
-            assert field in parsed
+            assert field in parsed_report
         # Per-item fields
-        item = parsed["items"][0]
+        item = parsed_report["items"][0]
         for field in ("tag", "count_window", "total_seen", "severity",
                       "pattern", "sample", "hash"):
             assert field in item
 
+    def test_item_has_no_instance_dict(self):
+        """ReportItem should use ``__slots__`` to keep per-item memory low."""
+        assert not hasattr(_make_item(), "__dict__")
+
+    def test_report_is_frozen(self, report):
+        """Report should be immutable so one instance can be shared safely."""
+        with pytest.raises(FrozenInstanceError):
+            report.source = "other"
+
+    def test_to_dict_matches_asdict(self):
+        """``Report.to_dict`` should produce exactly what ``dataclasses.asdict``
+        would, including key order, so the JSON output is unchanged."""
+        report = _make_report(items=[_make_item(), _make_item(tag="seen")])
+        expected = asdict(report)
+        assert report.to_dict() == expected
+        assert list(report.to_dict()) == list(expected)
+        assert list(report.to_dict()["items"][0]) == list(expected["items"][0])
+
+
+class TestWriteReportJson:
+    """Verify the streaming JSON writer matches ``report_to_json`` exactly."""
+
+    @pytest.mark.parametrize("n_items", [0, 1, 3])
+    def test_matches_report_to_json(self, n_items):
+        """Streamed output should be byte-for-byte identical to the
+        one-shot encoder, including the empty-items case."""
+        items = [_make_item(pattern=f"p{i}\nline") for i in range(n_items)]
+        report = _make_report(items=items)
+        buf = io.StringIO()
+        write_report_json(report, buf)
+        assert buf.getvalue() == report_to_json(report)
+
+    def test_yields_per_item(self):
+        """The encoder should yield chunks rather than one big string."""
+        report = _make_report(items=[_make_item(), _make_item()])
+        assert len(list(iter_report_json(report))) > 2
+
+
+def _render(report, show_samples=False):
+    """Helper: return the text report as a string instead of printing it."""
+    buf = io.StringIO()
+    print_text_report(report, show_samples=show_samples, file=buf)
+    return buf.getvalue()
+
 
 class TestPrintTextReport:
-    """Verify human-readable text report output via stdout capture."""
+    """Verify human-readable text report output, rendered into a ``StringIO``."""
 
-    def test_outputs_header(self, capsys):
+    def test_outputs_header(self, report):
         """The text report should start with a header banner containing the
         report title and the source description."""
-        report = _make_report(items=[_make_item()])
-        print_text_report(report, show_samples=False)
-        out = capsys.readouterr().out
+        out = _render(report)
         assert "Log Whisperer Report" in out
         assert "test:src" in out
 
-    def test_empty_items_shows_no_patterns(self, capsys):
+    def test_empty_items_shows_no_patterns(self):
         """When there are no report items, the output should display a
         user-friendly 'No patterns to show.' message."""
         report = _make_report()
-        print_text_report(report, show_samples=False)
-        out = capsys.readouterr().out
+        out = _render(report)
         assert "No patterns to show." in out
 
-    def test_show_samples_includes_sample(self, capsys):
+    def test_show_samples_includes_sample(self, report):
         """With ``show_samples=True``, each pattern's raw sample line should
         be printed below the pattern summary."""
-        report = _make_report(items=[_make_item()])
-        print_text_report(report, show_samples=True)
-        out = capsys.readouterr().out
+        out = _render(report, show_samples=True)
         assert "sample:" in out
         assert "raw sample line" in out
 
-    def test_tip_shown(self, capsys):
+    def test_tip_shown(self, report):
         """A usage tip mentioning ``--show-new`` should appear at the bottom
         of every text report to guide new users."""
-        report = _make_report(items=[_make_item()])
-        print_text_report(report, show_samples=False)
-        out = capsys.readouterr().out
+        out = _render(report)
         assert "--show-new" in out
 
-    def test_baseline_active_shown(self, capsys):
+    def test_baseline_active_shown(self):
         """When baseline learning is active, the report header should include
         a ``'Baseline: ACTIVE'`` notice so users know alerts are suppressed."""
         report = _make_report(baseline_active=True, baseline_until=1700000000)
-        print_text_report(report, show_samples=False)
-        out = capsys.readouterr().out
+        out = _render(report)
         assert "Baseline: ACTIVE" in out
+
+    def test_defaults_to_stdout(self, report, capsys):
+        """Without ``file=``, the report should be written to stdout."""
+        print_text_report(report, show_samples=False)
+        assert "Log Whisperer Report" in capsys.readouterr().out
@@ -4,11 +4,14 @@ Validates that ``read_file`` correctly reads the tail of a file and
 handles edge cases (missing files, empty files, fewer lines than the
 limit).  Also verifies that the ``read_lines`` dispatcher routes CLI
 arguments to the correct log source reader and produces the expected
-source description string.
+source description string, and that command sources push the line limit
+down to docker / journalctl.
 """
 
 import pytest
 
+import log_whisperer.sources as sources_mod
+from log_whisperer.sources import compose, docker, journal
 from log_whisperer.sources.file import read_file
 from log_whisperer.sources import read_lines
 
@@ -16,26 +19,28 @@ from log_whisperer.sources import read_lines
 # ---------------------------------------------------------------------------
 # read_file
 # ---------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def log_big(log_dir):
+    """A ~2.4 MB log file spanning many read blocks, written once, and the
+    list of lines it contains.  Read-only, like the conftest ``log_*`` files."""
+    lines = [f"line {i} " + "x" * 50 for i in range(40000)]
+    p = log_dir / "big.log"
+    p.write_text("\n".join(lines) + "\n")
+    return p, lines
+
+
 class TestReadFile:
     """Verify plain text file reading with line-limit slicing."""
 
-    def test_reads_last_n_lines(self, tmp_path):
+    def test_reads_last_n_lines(self, log20):
         """When the file has more lines than the limit, only the last N
         lines should be returned (tail behaviour)."""
-        f = tmp_path / "test.log"
-        f.write_text("\n".join(f"line{i}" for i in range(20)))
-        result = read_file(str(f), limit=5)
-        assert len(result) == 5
-        # The very last line of the file should be the last element
-        assert result[-1] == "line19"
-
-    def test_fewer_lines_than_limit(self, tmp_path):
+        assert read_file(str(log20), limit=5) == ["line15", "line16", "line17", "line18", "line19"]
+
+    def test_fewer_lines_than_limit(self, log_small):
         """When the file has fewer lines than the limit, all lines should
         be returned without error."""
-        f = tmp_path / "test.log"
-        f.write_text("one\ntwo\nthree")
-        result = read_file(str(f), limit=100)
-        assert len(result) == 3
+        assert read_file(str(log_small), limit=100) == ["one", "two", "three"]
 
     def test_nonexistent_file_raises(self):
         """Attempting to read a file that does not exist should raise
@@ -43,12 +48,16 @@ class TestReadFile:
         with pytest.raises(RuntimeError, match="File not found"):
             read_file("/tmp/does_not_exist_xyz_12345.log", limit=10)
 
-    def test_empty_file(self, tmp_path):
+    def test_large_file_tailed_from_end(self, log_big):
+        """Files spanning many blocks are read backwards; the result should
+        match a plain full read of the last N lines."""
+        path, lines = log_big
+        assert read_file(str(path), limit=3000) == lines[-3000:]
+        assert read_file(str(path), limit=1) == lines[-1:]
+
+    def test_empty_file(self, log_empty):
         """An empty file should return an empty list, not an error."""
-        f = tmp_path / "empty.log"
-        f.write_text("")
-        result = read_file(str(f), limit=10)
-        assert result == []
+        assert read_file(str(log_empty), limit=10) == []
 
 
 # ---------------------------------------------------------------------------
@@ -58,15 +67,35 @@ class TestReadLines:
     """Verify that ``read_lines`` routes to the correct source reader based
     on CLI arguments and returns a ``(lines, src_desc)`` tuple."""
 
-    def test_file_dispatches_correctly(self, tmp_path, make_args):
-        """When ``args.file`` is set, ``read_lines`` should call ``read_file``
-        and return the file's contents along with a ``'file:<path>'`` descriptor."""
-        f = tmp_path / "test.log"
-        f.write_text("hello\nworld\n")
-        args = make_args(file=str(f))
-        lines, src_desc = read_lines(args)
-        assert lines == ["hello", "world"]
-        assert src_desc == f"file:{f}"
+    @pytest.fixture
+    def stub_source(self, monkeypatch):
+        """Return ``stub(name, fn)``, which replaces the reader *name* (e.g.
+        ``"read_docker"``) as seen by ``read_lines`` for this test."""
+
+        def _stub(name, fn):
+            monkeypatch.setattr(sources_mod, name, fn)
+
+        return _stub
+
+    @pytest.mark.parametrize(
+        "flags, reader, expected_desc",
+        [
+            ({"docker": "mycontainer"}, "read_docker", "docker:mycontainer"),
+            ({"compose": "web"}, "read_compose", "compose:web"),
+            ({"compose_all": True}, "read_compose_all", "compose:all"),
+            ({"service": "sshd"}, "read_journal", "journal:sshd"),
+            ({"file": "/var/log/app.log"}, "read_file", "file:/var/log/app.log"),
+        ],
+        ids=["docker", "compose", "compose-all", "service", "file"],
+    )
+    def test_dispatch(self, make_args, stub_source, flags, reader, expected_desc):
+        """Each source flag should route to its reader and produce the
+        matching ``'<kind>:<name>'`` descriptor.  Readers are stubbed, so no
+        Docker daemon, journalctl binary or log file is needed."""
+        stub_source(reader, lambda *args: [f"{reader} line"])
+        lines, src_desc = read_lines(make_args(**flags))
+        assert lines == [f"{reader} line"]
+        assert src_desc == expected_desc
 
     def test_no_source_raises(self, make_args):
         """When no source flag is set, ``read_lines`` should raise RuntimeError
@@ -75,47 +104,61 @@ class TestReadLines:
         with pytest.raises(RuntimeError, match="No log source"):
             read_lines(args)
 
-    def test_src_desc_format_file(self, tmp_path, make_args):
-        """The source description for file sources should start with the
-        ``'file:'`` prefix."""
-        f = tmp_path / "app.log"
-        f.write_text("log line\n")
-        args = make_args(file=str(f))
-        _, src_desc = read_lines(args)
-        assert src_desc.startswith("file:")
-
-    def test_docker_src_desc(self, make_args, monkeypatch):
-        """When ``args.docker`` is set, the dispatcher should call
-        ``read_docker`` and produce a ``'docker:<container>'`` descriptor.
-
-        Uses monkeypatch to replace ``read_docker`` so no real Docker
-        daemon is needed.
-        """
-        import log_whisperer.sources as sources_mod
-        # Replace the real reader with a stub that returns canned output
-        monkeypatch.setattr(
-            sources_mod, "read_docker",
-            lambda container, since, limit: ["docker line"],
-        )
-        args = make_args(docker="mycontainer")
-        lines, src_desc = read_lines(args)
-        assert lines == ["docker line"]
-        assert src_desc == "docker:mycontainer"
-
-    def test_service_src_desc(self, make_args, monkeypatch):
-        """When ``args.service`` is set, the dispatcher should call
-        ``read_journal`` and produce a ``'journal:<unit>'`` descriptor.
-
-        Uses monkeypatch to replace ``read_journal`` so no real
-        journalctl binary is needed.
-        """
-        import log_whisperer.sources as sources_mod
-        # Replace the real reader with a stub that returns canned output
-        monkeypatch.setattr(
-            sources_mod, "read_journal",
-            lambda service, since, limit: ["journal line"],
-        )
-        args = make_args(service="sshd")
-        lines, src_desc = read_lines(args)
-        assert lines == ["journal line"]
-        assert src_desc == "journal:sshd"
+    def test_since_epoch_overrides_since(self, make_args, stub_source):
+        """A *since_epoch* should be passed to docker as a bare timestamp
+        and to journalctl in its ``@<epoch>`` form."""
+        seen = []
+        stub_source("read_docker", lambda container, since, limit: seen.append(since) or [])
+        stub_source("read_journal", lambda service, since, limit: seen.append(since) or [])
+        read_lines(make_args(docker="c"), since_epoch=1700000000)
+        read_lines(make_args(service="s"), since_epoch=1700000000)
+        assert seen == ["1700000000", "@1700000000"]
+
+
+# ---------------------------------------------------------------------------
+# command sources
+# ---------------------------------------------------------------------------
+class TestCommandSources:
+    """Verify the commands built by the docker, compose and journal sources."""
+
+    @pytest.fixture
+    def captured(self, monkeypatch):
+        """Replace the subprocess helpers in each source module with a recorder."""
+        calls = []
+
+        def fake(cmd, *args, **kwargs):
+            calls.append(cmd)
+            return []
+
+        monkeypatch.setattr(docker, "iter_cmd", fake)
+        monkeypatch.setattr(compose, "run_cmd_tail", fake)
+        monkeypatch.setattr(journal, "run_cmd_tail", fake)
+        return calls
+
+    def test_limit_passed_to_commands(self, captured):
+        """Each command should ask for at most *limit* lines at the source."""
+        docker.read_docker("api", "1h", 50)
+        compose.read_compose("web", "1h", 50)
+        compose.read_compose_all("1h", 50)
+        journal.read_journal("sshd", "1h", 50)
+        assert [cmd[cmd.index("--tail") + 1] for cmd in captured[:3]] == ["50"] * 3
+        assert captured[3][captured[3].index("-n") + 1] == "50"
+
+    @pytest.mark.parametrize(
+        "module, helper, reader, output, expected",
+        [
+            # Multi-line journal entries print more lines than -n entries;
+            # the newest lines are kept
+            pytest.param(
+                journal, "run_cmd_tail", journal.read_journal, r"1\n2\ntrace\n3\n", ["2", "trace", "3"], id="journal"
+            ),
+            # A lone \r splits one of Docker's --tail lines in two
+            pytest.param(docker, "iter_cmd", docker.read_docker, r"1\r2\n3\n4\n", ["1", "2", "3"], id="docker"),
+        ],
+    )
+    def test_output_bounded_by_limit(self, monkeypatch, module, helper, reader, output, expected):
+        """A source should yield at most *limit* lines even when the command
+        prints more than it was asked for."""
+        real = getattr(module, helper)
+        monkeypatch.setattr(module, helper, lambda cmd, *a, **kw: real(["printf", output], *a, **kw))
+        assert list(reader("x", "1h", 3)) == expected
@@ -7,10 +7,14 @@ learning activation/persistence, and the ``parse_duration`` /
 """
 
 import json
+import sys
 import time
+from dataclasses import asdict
+from datetime import datetime
 
 import pytest
 
+from log_whisperer.normalize import normalize_line, pattern_hash
 from log_whisperer.state import (
     PatternRecord,
     PatternDB,
@@ -23,46 +27,54 @@ from log_whisperer.state import (
 # ---------------------------------------------------------------------------
 # PatternRecord
 # ---------------------------------------------------------------------------
+# Representative record shared by the PatternRecord tests (none mutate it),
+# and its to_dict() payload as stored in the DB
+_SAMPLE_RECORD = PatternRecord(
+    h="abc123",
+    first_seen=1000,
+    last_seen=2000,
+    total_seen=5,
+    severity="ERROR",
+    pattern="test <N>",
+    sample="test 42",
+)
+_SAMPLE_DICT = _SAMPLE_RECORD.to_dict()
+
+
 class TestPatternRecord:
     """Verify serialization and deserialization of individual pattern records."""
 
-    def _make_record(self):
-        """Helper: build a representative PatternRecord for reuse across tests."""
-        return PatternRecord(
-            h="abc123",
-            first_seen=1000,
-            last_seen=2000,
-            total_seen=5,
-            severity="ERROR",
-            pattern="test <N>",
-            sample="test 42",
-        )
-
     def test_to_dict_round_trip(self):
         """Serializing a record with ``to_dict()`` and deserializing it back
         with ``from_dict()`` should produce an identical record."""
-        rec = self._make_record()
-        d = rec.to_dict()
-        rec2 = PatternRecord.from_dict(d)
-        assert rec == rec2
+        assert PatternRecord.from_dict(_SAMPLE_RECORD.to_dict()) == _SAMPLE_RECORD
+
+    def test_from_dict_interns_severity(self):
+        """Loaded severities should share one string object per value."""
+        d = {**_SAMPLE_DICT, "severity": "".join(["ERR", "OR"])}
+        assert PatternRecord.from_dict(d).severity is sys.intern("ERROR")
+
+    def test_to_dict_matches_asdict(self):
+        """``to_dict`` should equal ``dataclasses.asdict``, key order included,
+        so DB lines are unchanged."""
+        assert list(_SAMPLE_DICT.items()) == list(asdict(_SAMPLE_RECORD).items())
+
+    def test_has_no_instance_dict(self):
+        """PatternRecord should use ``__slots__`` so large DBs don't pay for
+        a per-record ``__dict__``."""
+        assert not hasattr(_SAMPLE_RECORD, "__dict__")
 
     def test_from_dict_coerces_ints(self):
         """``from_dict`` should coerce string values to int for numeric fields
         (first_seen, last_seen, total_seen) to handle JSON data that was
         stored or edited as strings."""
         d = {
-            "h": "abc",
-            "first_seen": "100",   # string, not int
-            "last_seen": "200",
-            "total_seen": "3",
-            "severity": "INFO",
-            "pattern": "p",
-            "sample": "s",
+            **_SAMPLE_DICT,
+            "first_seen": "1000",  # string, not int
+            "last_seen": "2000",
+            "total_seen": "5",
         }
-        rec = PatternRecord.from_dict(d)
-        assert rec.first_seen == 100
-        assert rec.last_seen == 200
-        assert rec.total_seen == 3
+        assert PatternRecord.from_dict(d) == _SAMPLE_RECORD
 
 
 # ---------------------------------------------------------------------------
@@ -109,7 +121,8 @@ class TestPatternDB:
 
     def test_records_sorted_by_hash(self, db_path):
         """Saved records should appear in lexicographic order of their hash
-        key so output is deterministic across runs."""
+        key so output is deterministic across runs, and compaction should
+        keep that order after out-of-order appends."""
         db = PatternDB(db_path)
         records = {
             "zzz": PatternRecord("zzz", 1, 2, 1, "INFO", "z", "z"),
@@ -119,8 +132,118 @@ class TestPatternDB:
         db.save(records)
         # Parse the raw file to check on-disk ordering
         lines = db_path.read_text().strip().splitlines()
-        hashes = [json.loads(line)["h"] for line in lines]
-        assert hashes == ["aaa", "mmm", "zzz"]
+        assert [json.loads(line)["h"] for line in lines] == ["aaa", "mmm", "zzz"]
+        db.append([PatternRecord("ccc", 1, 2, 1, "INFO", "c", "c")])
+        db.compact()
+        lines = db_path.read_text().strip().splitlines()
+        assert [json.loads(line)["h"] for line in lines] == ["aaa", "ccc", "mmm", "zzz"]
+
+    def test_legacy_sha1_keys_rekeyed(self, db_path):
+        """Records written with a 40-character SHA-1 key by older versions
+        should be re-keyed with the current pattern hash on load, so they
+        are still recognised as already seen."""
+        legacy = PatternRecord("a" * 40, 1, 2, 3, "INFO", "pat <N>", "pat 1")
+        db_path.write_text(json.dumps(legacy.to_dict()) + "\n")
+        loaded = PatternDB(db_path).load()
+        assert list(loaded) == [pattern_hash("pat <N>")]
+        assert loaded[pattern_hash("pat <N>")].total_seen == 3
+
+    def test_legacy_keys_rekeyed_from_sample(self, db_path):
+        """Legacy records must be re-keyed from the raw sample, not the
+        stored pattern: older versions normalized IDs inside paths
+        separately (``<PATH>/<UUID>``), so hashing the old pattern would
+        report every such pattern as NEW after an upgrade."""
+        sample = "GET /api/users/abc12345-dead-beef-cafe-123456789abc 200"
+        legacy = PatternRecord("a" * 40, 1, 2, 3, "INFO", "GET <PATH>/<UUID> <N>", sample)
+        db_path.write_text(json.dumps(legacy.to_dict()) + "\n")
+        loaded = PatternDB(db_path).load()
+        current = normalize_line(sample)
+        assert list(loaded) == [pattern_hash(current)]
+        assert loaded[pattern_hash(current)].pattern == current
+
+    def test_legacy_records_merged_when_patterns_collapse(self, db_path):
+        """Two legacy patterns that the current normalizer maps to the same
+        pattern should be merged rather than one overwriting the other."""
+        lines = [
+            PatternRecord("a" * 40, 10, 20, 3, "INFO", "open <PATH>/<UUID>",
+                          "open /data/abc12345-dead-beef-cafe-123456789abc"),
+            PatternRecord("b" * 40, 5, 30, 4, "INFO", "open <PATH>/<N>", "open /data/42"),
+        ]
+        db_path.write_text("".join(json.dumps(r.to_dict()) + "\n" for r in lines))
+        loaded = PatternDB(db_path).load()
+        assert len(loaded) == 1
+        rec = next(iter(loaded.values()))
+        assert (rec.first_seen, rec.last_seen, rec.total_seen) == (5, 30, 7)
+
+    def test_legacy_records_rewritten_once(self, db_path):
+        """The first load that re-keys legacy records should store them
+        under their new keys, so later loads find no legacy lines."""
+        legacy = PatternRecord("a" * 40, 1, 2, 3, "INFO", "pat <N>", "pat 1")
+        db_path.write_text(json.dumps(legacy.to_dict()) + "\n")
+        PatternDB(db_path).load()
+        stored = [json.loads(line)["h"] for line in db_path.read_text().splitlines()]
+        assert stored == [pattern_hash("pat <N>")]
+
+    def test_load_subset_returns_only_requested(self, db_path):
+        """``load_subset`` should return just the requested hashes, using
+        the latest line for each, and ignore hashes not in the DB."""
+        a, b = pattern_hash("a"), pattern_hash("b")
+        db = PatternDB(db_path)
+        db.save({
+            a: PatternRecord(a, 1, 2, 1, "INFO", "a", "a"),
+            b: PatternRecord(b, 1, 2, 1, "INFO", "b", "b"),
+        })
+        db.append([PatternRecord(a, 1, 3, 2, "INFO", "a", "a")])
+        loaded = PatternDB(db_path).load_subset([a, "missing"])
+        assert list(loaded) == [a]
+        assert loaded[a].total_seen == 2
+
+    def test_load_subset_rekeys_legacy_records(self, db_path):
+        """Legacy SHA-1 keyed lines should be matched by their re-keyed hash."""
+        legacy = PatternRecord("a" * 40, 1, 2, 3, "INFO", "pat <N>", "pat 1")
+        db_path.write_text(json.dumps(legacy.to_dict()) + "\n")
+        loaded = PatternDB(db_path).load_subset([pattern_hash("pat <N>")])
+        assert len(loaded) == 1
+
+    def test_append_supersedes_earlier_lines(self, db_path):
+        """Appended records should win over earlier lines for the same hash,
+        and untouched records should be left as they were."""
+        db = PatternDB(db_path)
+        db.save({
+            "h1": PatternRecord("h1", 1, 2, 3, "INFO", "a", "a"),
+            "h2": PatternRecord("h2", 1, 2, 1, "INFO", "b", "b"),
+            "h3": PatternRecord("h3", 1, 2, 1, "INFO", "c", "c"),
+        })
+        db.load()
+        db.append([PatternRecord("h1", 1, 9, 4, "INFO", "a", "a")])
+        assert len(db_path.read_text().splitlines()) == 4
+        loaded = PatternDB(db_path).load()
+        assert loaded["h1"].total_seen == 4
+        assert loaded["h1"].last_seen == 9
+        assert loaded["h2"].total_seen == 1
+
+    def test_append_after_partial_line(self, db_path):
+        """If a crashed run left the file ending mid-record, the next
+        appended record should start on its own line and still load."""
+        db = PatternDB(db_path)
+        db.save({"h1": PatternRecord("h1", 1, 2, 1, "INFO", "a", "a")})
+        # Truncate the line in the middle, dropping its trailing newline
+        db_path.write_text(db_path.read_text()[:-10])
+        db.load()
+        db.append([PatternRecord("h2", 1, 2, 1, "INFO", "b", "b")])
+        loaded = PatternDB(db_path).load()
+        assert list(loaded) == ["h2"]
+
+    def test_append_compacts_stale_lines(self, db_path):
+        """Once stale lines outnumber live records, ``append`` should rewrite
+        the file with one line per record."""
+        db = PatternDB(db_path)
+        db.save({"h1": PatternRecord("h1", 1, 2, 1, "INFO", "a", "a")})
+        db.load()
+        for n in range(2, 5):
+            db.append([PatternRecord("h1", 1, 2, n, "INFO", "a", "a")])
+        assert len(db_path.read_text().splitlines()) <= 2
+        assert PatternDB(db_path).load()["h1"].total_seen == 4
 
     def test_reset_removes_file(self, db_path):
         """``reset()`` should delete the DB file from disk."""
@@ -172,18 +295,43 @@ class TestBaselineState:
         BaselineState.reset(baseline_path)
         assert not baseline_path.exists()
 
-    def test_enable_learning_sets_future_timestamp(self, baseline_path):
+    def test_enable_learning_sets_future_timestamp(self, baseline_path, monkeypatch):
         """``enable_learning(path, seconds)`` should write a baseline_until
-        timestamp that is ``seconds`` in the future (±1 s for clock jitter)."""
-        before = int(time.time())
+        timestamp exactly ``seconds`` after the current time."""
+        # Freeze the clock so the expected expiry is exact
+        monkeypatch.setattr(time, "time", lambda: 1_700_000_000.5)
         until = BaselineState.enable_learning(baseline_path, 3600)
-        after = int(time.time())
-        # The written timestamp should be now + 3600, within the test window
-        assert before + 3600 <= until <= after + 3600
+        assert until == 1_700_003_600
         # The file on disk should match what was returned
         loaded = BaselineState.load(baseline_path)
         assert loaded.baseline_until == until
 
+    def test_record_run_keeps_baseline(self, baseline_path):
+        """``record_run`` should store the run start time without touching
+        an active baseline learning period."""
+        BaselineState(baseline_until=9999).save(baseline_path)
+        BaselineState.record_run(baseline_path, "docker:a", 1234)
+        loaded = BaselineState.load(baseline_path)
+        assert loaded.last_run == {"docker:a": 1234}
+        assert loaded.baseline_until == 9999
+
+    def test_record_run_per_source(self, baseline_path):
+        """Runs of different sources should be recorded side by side, so
+        one source never picks up another source's start time."""
+        BaselineState.record_run(baseline_path, "docker:a", 1000)
+        BaselineState.record_run(baseline_path, "docker:b", 2000)
+        BaselineState.record_run(baseline_path, "docker:a", 3000)
+        assert BaselineState.load(baseline_path).last_run == {"docker:a": 3000, "docker:b": 2000}
+
+    def test_legacy_global_last_run_ignored(self, baseline_path):
+        """A pre-per-source file with one integer ``last_run`` cannot be
+        attributed to a source, so it should load as no recorded runs
+        while keeping the rest of the state."""
+        baseline_path.write_text('{"baseline_until": 9999, "last_run": 1234}')
+        loaded = BaselineState.load(baseline_path)
+        assert loaded.last_run == {}
+        assert loaded.baseline_until == 9999
+
 
 # ---------------------------------------------------------------------------
 # parse_duration
@@ -191,26 +339,20 @@ class TestBaselineState:
 class TestParseDuration:
     """Verify human-friendly duration string parsing into seconds."""
 
-    def test_seconds(self):
-        """``'30s'`` should parse to 30 seconds."""
-        assert parse_duration("30s") == 30
-
-    def test_minutes(self):
-        """``'10m'`` should parse to 600 seconds (10 * 60)."""
-        assert parse_duration("10m") == 600
-
-    def test_hours(self):
-        """``'2h'`` should parse to 7200 seconds (2 * 3600)."""
-        assert parse_duration("2h") == 7200
-
-    def test_days(self):
-        """``'1d'`` should parse to 86400 seconds (1 * 86400)."""
-        assert parse_duration("1d") == 86400
-
-    def test_whitespace_tolerance(self):
-        """Leading/trailing whitespace around the duration string should be
-        stripped before parsing."""
-        assert parse_duration(" 10m ") == 600
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("30s", 30),
+            ("10m", 600),  # 10 * 60
+            ("2h", 7200),  # 2 * 3600
+            ("1d", 86400),
+            (" 10m ", 600),  # surrounding whitespace is stripped
+        ],
+    )
+    def test_parses(self, text, expected):
+        """Each supported unit (s, m, h, d) should convert to the right
+        number of seconds."""
+        assert parse_duration(text) == expected
 
     @pytest.mark.parametrize("bad", ["25q", "", "abc", "m10", "  "])
     def test_invalid_raises_value_error(self, bad):
@@ -226,14 +368,21 @@ class TestParseDuration:
 class TestFmtLocalTs:
     """Verify epoch-to-local-time formatting."""
 
-    def test_format(self):
-        """``fmt_local_ts`` should return a 19-character string matching the
-        pattern ``YYYY-MM-DD HH:MM:SS`` regardless of the local timezone."""
-        result = fmt_local_ts(0)
-        # Verify structural positions of delimiters
-        assert len(result) == 19
-        assert result[4] == "-"    # YYYY-
-        assert result[7] == "-"    # MM-
-        assert result[10] == " "   # DD<space>
-        assert result[13] == ":"   # HH:
-        assert result[16] == ":"   # MM:
+    @pytest.fixture
+    def utc(self):
+        """Switch the process local timezone to UTC for the test.
+
+        Uses its own ``MonkeyPatch`` so teardown restores only ``TZ``, then
+        re-applies the original timezone with ``tzset``.
+        """
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setenv("TZ", "UTC")
+            time.tzset()
+            yield
+        time.tzset()
+
+    def test_format(self, utc):
+        """``fmt_local_ts`` should format as ``YYYY-MM-DD HH:MM:SS`` in local
+        time; with TZ=UTC the epoch must round-trip through ``strptime``."""
+        parsed = datetime.strptime(fmt_local_ts(0), "%Y-%m-%d %H:%M:%S")
+        assert parsed == datetime(1970, 1, 1)
@@ -1,67 +1,129 @@
 """Tests for log_whisperer.sources._subprocess — shared subprocess helper.
 
-Validates that ``run_cmd`` correctly captures stdout from successful
-commands, raises ``RuntimeError`` with descriptive messages for missing
-binaries and non-zero exits, and handles empty output gracefully.
+Validates that ``run_cmd_tail`` and ``iter_cmd`` capture stdout (and
+stderr when merged), raise ``RuntimeError`` with descriptive messages for
+missing binaries and non-zero exits, and handle empty output gracefully.
+Also covers tail-limiting, decoding, and ``iter_cmd``'s streaming.
 """
 
 import pytest
 
-from log_whisperer.sources._subprocess import run_cmd
+from log_whisperer.sources._subprocess import iter_cmd, run_cmd_tail
 
 
-class TestRunCmd:
-    """Verify subprocess execution, error handling, and output capture."""
+# Prints one line to each stream, stdout first
+_OUT_AND_ERR = ["sh", "-c", "echo out; echo err >&2"]
+# Prints an error message to stderr and fails
+_FAIL_MSG = ["sh", "-c", "echo 'fail msg' >&2; exit 1"]
 
-    def test_successful_command(self):
-        """A command that exits 0 should return its stdout as a string."""
-        result = run_cmd(["echo", "hello"])
-        assert result.strip() == "hello"
 
-    def test_command_not_found(self):
-        """Attempting to run a non-existent binary should raise RuntimeError
-        with a ``'Command not found'`` message referencing the binary name."""
+def _tail(argv, merge_stderr):
+    return run_cmd_tail(argv, limit=10, merge_stderr=merge_stderr)
+
+
+def _iter(argv, merge_stderr):
+    return list(iter_cmd(argv, merge_stderr=merge_stderr))
+
+
+class TestCapture:
+    """Verify output capture and error reporting shared by ``run_cmd_tail``
+    and ``iter_cmd``; every case runs against both."""
+
+    @pytest.fixture(params=[_tail, _iter], ids=["run_cmd_tail", "iter_cmd"])
+    def run(self, request):
+        """Run a command with one of the helpers and return its lines."""
+        return request.param
+
+    @pytest.mark.parametrize(
+        "argv, merge_stderr, expected",
+        [
+            # A command that exits 0 returns its stdout lines
+            pytest.param(["echo", "hello"], False, ["hello"], id="stdout"),
+            # No output gives an empty list
+            pytest.param(["true"], False, [], id="empty-stdout"),
+            # By default stderr is captured separately and not returned
+            pytest.param(_OUT_AND_ERR, False, ["out"], id="stderr-dropped"),
+            # With merge_stderr=True stderr lines are returned too
+            pytest.param(_OUT_AND_ERR, True, ["out", "err"], id="stderr-merged"),
+            # A lone \r ends a line as in text mode; \r\n is one terminator
+            pytest.param(["printf", r"a\rb\r\nc"], False, ["a", "b", "c"], id="carriage-returns"),
+        ],
+    )
+    def test_output(self, run, argv, merge_stderr, expected):
+        """Successful commands should return exactly the captured lines."""
+        assert run(argv, merge_stderr) == expected
+
+    @pytest.mark.parametrize(
+        "argv, merge_stderr, match",
+        [
+            # A missing binary is reported by name
+            pytest.param(["nonexistent_binary_xyz_12345"], False, "Command not found", id="not-found"),
+            # A non-zero exit is reported with its return code
+            pytest.param(["false"], False, r"Command failed \(1\)", id="nonzero-exit"),
+            # The message quotes stderr, whether or not it was merged
+            pytest.param(_FAIL_MSG, False, "fail msg", id="error-output"),
+            pytest.param(_FAIL_MSG, True, "fail msg", id="merged-error-output"),
+        ],
+    )
+    def test_errors_raise(self, run, argv, merge_stderr, match):
+        """Missing binaries and non-zero exits should raise RuntimeError
+        with a descriptive message."""
+        with pytest.raises(RuntimeError, match=match):
+            run(argv, merge_stderr)
+
+
+class TestRunCmdTail:
+    """Verify streaming tail capture and error handling in ``run_cmd_tail``."""
+
+    def test_returns_last_lines(self):
+        """Only the last *limit* lines of stdout should be returned, with
+        line terminators stripped."""
+        result = run_cmd_tail(["seq", "1", "100"], limit=3)
+        assert result == ["98", "99", "100"]
+
+    def test_limit_counts_split_lines(self):
+        """Lines split on a lone ``\\r`` should count towards *limit*."""
+        assert run_cmd_tail(["printf", r"a\rb\rc\n"], limit=2) == ["b", "c"]
+
+    def test_fewer_lines_than_limit(self):
+        """When the command prints fewer lines than the limit, all of them
+        should be returned."""
+        assert run_cmd_tail(["seq", "1", "2"], limit=10) == ["1", "2"]
+
+    def test_invalid_utf8_replaced(self):
+        """Bytes that aren't valid UTF-8 should be replaced rather than
+        aborting the read, and CRLF terminators stripped."""
+        result = run_cmd_tail(["printf", "ok\\r\\nbad \\377 byte\\n"], limit=10)
+        assert result == ["ok", "bad � byte"]
+
+
+class TestIterCmd:
+    """Verify line streaming and error handling in ``iter_cmd``."""
+
+    def test_yields_all_lines(self):
+        """Every stdout line should be yielded in order, terminators stripped."""
+        assert list(iter_cmd(["seq", "1", "3"])) == ["1", "2", "3"]
+
+    def test_yields_before_command_exits(self):
+        """Lines should be available while the command is still running."""
+        it = iter_cmd(["sh", "-c", "echo first; sleep 5; echo second"])
+        assert next(it) == "first"
+        it.close()
+
+    def test_command_not_found_raised_on_call(self):
+        """A missing binary should raise immediately, before iteration."""
         with pytest.raises(RuntimeError, match="Command not found"):
-            run_cmd(["nonexistent_binary_xyz_12345"])
-
-    def test_nonzero_exit_raises(self):
-        """A command that exits with a non-zero status (e.g. ``false``) should
-        raise RuntimeError with a ``'Command failed'`` message that includes
-        the return code."""
-        with pytest.raises(RuntimeError, match="Command failed"):
-            run_cmd(["false"])
-
-    def test_empty_stdout(self):
-        """A command that produces no output (e.g. ``true``) should return
-        an empty string rather than None."""
-        result = run_cmd(["true"])
-        assert result == ""
-
-    # -- merge_stderr ---------------------------------------------------------
-
-    def test_merge_stderr_captures_stderr(self):
-        """When ``merge_stderr=True``, output written to stderr by the child
-        process should appear in the returned string."""
-        result = run_cmd(
-            ["sh", "-c", "echo out; echo err >&2"],
-            merge_stderr=True,
-        )
-        assert "out" in result
-        assert "err" in result
-
-    def test_default_does_not_include_stderr(self):
-        """By default (``merge_stderr=False``), only stdout is returned and
-        stderr content should be absent."""
-        result = run_cmd(["sh", "-c", "echo out; echo err >&2"])
-        assert "out" in result
-        assert "err" not in result
-
-    def test_merge_stderr_error_reports_combined_output(self):
-        """When ``merge_stderr=True`` and the command fails, the RuntimeError
-        message should include the combined output (since stderr is merged
-        into stdout)."""
-        with pytest.raises(RuntimeError, match="fail msg") as exc_info:
-            run_cmd(
-                ["sh", "-c", "echo 'fail msg' >&2; exit 1"],
-                merge_stderr=True,
-            )
+            iter_cmd(["nonexistent_binary_xyz_12345"])
+
+    def test_nonzero_exit_raised_after_output(self):
+        """A failing command should raise RuntimeError with its stderr once
+        its output has been consumed."""
+        it = iter_cmd(["sh", "-c", "echo out; echo 'fail msg' >&2; exit 1"])
+        assert next(it) == "out"
+        with pytest.raises(RuntimeError, match="fail msg"):
+            next(it)
+
+    def test_merge_stderr_error_quotes_output(self):
+        """With ``merge_stderr=True``, the error should quote the output."""
+        with pytest.raises(RuntimeError, match="No such container"):
+            list(iter_cmd(["sh", "-c", "echo 'No such container' >&2; exit 1"], merge_stderr=True))